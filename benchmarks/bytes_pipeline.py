@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+バイト列のまま解析する方式のベンチマーク
+取得したページを response.text（文字列）にしてから解析した場合と、
+本文のバイト列を宣言された文字コードとともに解析器へ直接渡した場合の解析時間とピークメモリを比較する
+
+使用例:
+    python benchmarks/bytes_pipeline.py --list list.html --detail detail1.html detail2.html
+    python benchmarks/bytes_pipeline.py --detail https://tabelog.com/tokyo/A1301/A130101/13000000/
+"""
+
+import argparse
+import os
+import sys
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import requests
+
+from config import Settings
+from partial_parse import report
+from scraping.http_client import declared_encoding
+from scraping.parser import Parser
+from scraping.scraper import Scraper
+
+
+def load_content(source):
+    """ファイルパスまたはURLから本文のバイト列とContent-Typeを読み込む"""
+    if source.startswith(('http://', 'https://')):
+        response = requests.get(source, headers=Settings.DEFAULT_HEADERS, timeout=Settings.REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.content, response.headers.get('Content-Type', 'text/html')
+    with open(source, 'rb') as f:
+        return f.read(), 'text/html; charset=UTF-8'
+
+
+def response_text(content, encoding):
+    """requestsのresponse.textと同じ方法で本文を文字列にする（encodingがNoneの場合は文字コードを推定）"""
+    response = requests.models.Response()
+    response._content = content
+    response.encoding = encoding
+    return response.text
+
+
+def text_cases(parse):
+    """文字列を経由する方式（宣言あり・宣言なし）とバイト列を渡す方式の計測対象を返す"""
+    return [
+        ('text（文字コード推定）', lambda page: parse(response_text(page[0], None), None)),
+        ('text（宣言どおり）', lambda page: parse(response_text(page[0], page[1]), None)),
+        ('バイト列', lambda page: parse(page[0], page[1]))
+    ]
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description='バイト列のまま解析する方式のベンチマーク')
+    parser.add_argument('--list', nargs='*', default=[], help='一覧ページのHTMLファイルまたはURL')
+    parser.add_argument('--detail', nargs='*', default=[], help='店舗詳細ページのHTMLファイルまたはURL')
+    parser.add_argument('--repeat', type=int, default=20, help='繰り返し回数')
+    args = parser.parse_args()
+    
+    if not args.list and not args.detail:
+        parser.error('--list または --detail を指定してください')
+        
+    if args.list:
+        pages = [
+            (content, declared_encoding(content_type, content))
+            for content, content_type in map(load_content, args.list)
+        ]
+        scraper = Scraper()
+        report('一覧ページ', text_cases(scraper._parse_list_page), pages, args.repeat)
+        
+    if args.detail:
+        pages = [
+            (content, declared_encoding(content_type, content))
+            for content, content_type in map(load_content, args.detail)
+        ]
+        for backend in Parser.BACKENDS:
+            detail_parser = Parser(backend=backend)
+            report(
+                f'店舗詳細ページ（{backend}バックエンド）',
+                text_cases(lambda html, encoding: detail_parser.parse_html(html, '', encoding=encoding)),
+                pages,
+                args.repeat
+            )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
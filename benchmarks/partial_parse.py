@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+部分解析（SoupStrainer）のベンチマーク
+一覧ページ・店舗詳細ページについて、ページ全体を解析した場合と
+必要な領域だけを解析した場合の解析時間とピークメモリを比較する
+
+使用例:
+    python benchmarks/partial_parse.py --list list.html --detail detail1.html detail2.html
+    python benchmarks/partial_parse.py --detail https://tabelog.com/tokyo/A1301/A130101/13000000/
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import requests
+from bs4 import BeautifulSoup
+
+from config import Settings
+from scraping.parser import Parser, LxmlExtractor, RegexExtractor
+from scraping.scraper import Scraper
+
+
+def load_page(source):
+    """ファイルパスまたはURLからHTMLを読み込む"""
+    if source.startswith(('http://', 'https://')):
+        response = requests.get(source, headers=Settings.DEFAULT_HEADERS, timeout=Settings.REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.text
+    with open(source, encoding='utf-8') as f:
+        return f.read()
+
+
+def measure(func, pages, repeat):
+    """
+    1ページあたりの平均解析時間とピークメモリを計測する
+    
+    Returns:
+        tuple: (平均時間（ミリ秒）, 最大のピークメモリ（KB）)
+    """
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            func(html)
+    elapsed = (time.perf_counter() - started_at) / (repeat * len(pages))
+    
+    # tracemallocは処理を遅くするため時間とは別に計測する
+    peak = 0
+    for html in pages:
+        tracemalloc.start()
+        func(html)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return elapsed * 1000, peak / 1024
+
+
+def report(title, cases, pages, repeat):
+    """計測結果を表示"""
+    print(f"\n{title}（{len(pages)}ページ × {repeat}回）")
+    print(f"{'方式':<24}{'時間(ms)':>12}{'ピーク(KB)':>14}")
+    baseline = None
+    for name, func in cases:
+        elapsed, peak = measure(func, pages, repeat)
+        if baseline is None:
+            baseline = (elapsed, peak)
+            ratio = ''
+        else:
+            ratio = f"  (時間 {elapsed / baseline[0]:.0%} / メモリ {peak / baseline[1]:.0%})"
+        print(f"{name:<24}{elapsed:>12.2f}{peak:>14.0f}{ratio}")
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description='部分解析のベンチマーク')
+    parser.add_argument('--list', nargs='*', default=[], help='一覧ページのHTMLファイルまたはURL')
+    parser.add_argument('--detail', nargs='*', default=[], help='店舗詳細ページのHTMLファイルまたはURL')
+    parser.add_argument('--repeat', type=int, default=20, help='繰り返し回数')
+    args = parser.parse_args()
+    
+    if not args.list and not args.detail:
+        parser.error('--list または --detail を指定してください')
+        
+    if args.list:
+        pages = [load_page(source) for source in args.list]
+        report('一覧ページ', [
+            ('BeautifulSoup（全体）', lambda html: BeautifulSoup(html, 'html.parser')),
+            ('BeautifulSoup（部分）', lambda html: BeautifulSoup(html, 'html.parser', parse_only=Scraper.LIST_STRAINER))
+        ], pages, args.repeat)
+        
+    if args.detail:
+        pages = [load_page(source) for source in args.detail]
+        bs4_parser = Parser(backend='bs4')
+        report('店舗詳細ページ', [
+            ('BeautifulSoup（全体）', lambda html: BeautifulSoup(html, 'html.parser')),
+            ('BeautifulSoup（部分）', lambda html: BeautifulSoup(html, 'html.parser', parse_only=Parser.DETAIL_STRAINER)),
+            ('bs4バックエンド（抽出込み）', lambda html: bs4_parser.parse_html_bs4(html, '')),
+            ('lxmlバックエンド（抽出込み）', lambda html: LxmlExtractor.extract(html, '')),
+            ('regexバックエンド（抽出込み）', lambda html: RegexExtractor.extract(html, ''))
+        ], pages, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
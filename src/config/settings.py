@@ -19,9 +19,50 @@ class Settings:
     # スクレイピング設定
     MAX_RETRIES = 3  # リトライ回数
     RETRY_WAIT_TIME = 5  # リトライ待機時間（秒）
+    RETRY_MAX_WAIT_TIME = 60  # リトライ待機時間の上限（秒）
+    RETRY_JITTER = 0.5  # リトライ待機時間のゆらぎ（±割合）
     REQUEST_TIMEOUT = 10  # リクエストタイムアウト（秒）
-    PAGE_WAIT_TIME = 2  # ページ間待機時間（秒）
-    SHOP_WAIT_TIME = 0.5  # 店舗間待機時間（秒）
+    REQUESTS_PER_SECOND = 2.0  # 1秒あたりの最大リクエスト数（キャッシュヒットは除く）
+    RATE_LIMIT_BURST = 4  # 連続して送信できる最大リクエスト数
+    
+    # 同時接続数の自動調整（AIMD）設定
+    ADAPTIVE_CONCURRENCY = True  # 応答状況に応じて同時接続数とレートを自動調整するか
+    AIMD_MIN_LIMIT = 1  # 同時接続数の下限
+    AIMD_DECREASE_FACTOR = 0.5  # 429/503・タイムアウト時の減少率
+    AIMD_DECREASE_COOLDOWN = 5  # 連続して減少させない間隔（秒）
+    AIMD_LATENCY_THRESHOLD = 3.0  # これより遅い応答では増加させない（秒）
+    AIMD_RATE_STEP = 0.25  # 1段階あたりのレート増加量（リクエスト/秒）
+    MIN_REQUESTS_PER_SECOND = 0.2  # レートの下限
+    MAX_REQUESTS_PER_SECOND = 8.0  # レートの上限
+    DETAIL_WORKERS = 4  # 店舗詳細ページの同時取得数
+    MAX_DETAIL_WORKERS = 16  # 店舗詳細ページの同時取得数の上限
+    LIST_WORKERS = 4  # 一覧ページの同時取得数（先読みするページ数）
+    LIST_PAGE_SIZE = 20  # 一覧ページ1ページあたりの店舗数
+    LIST_MAX_PAGE = 60  # 食べログの一覧で表示される最大ページ数
+    PIPELINE_QUEUE_SIZE = 100  # ステージ間キューの最大件数
+    QUEUE_POLL_INTERVAL = 0.5  # キュー待機中に停止要求を確認する間隔（秒）
+    
+    # HTML解析設定
+    PARSER_BACKEND = 'lxml'  # 'lxml'（高速）、'regex'（正規表現で抽出し、取得できない項目のみlxml）または 'bs4'（BeautifulSoup、比較検証用）
+    STREAM_DETAIL_PAGES = True  # 店舗詳細ページを受信しながら解析し、必要な情報が揃ったら受信を打ち切るか（lxmlのみ）
+    STREAM_CHUNK_SIZE = 16 * 1024  # 受信しながら解析する際のチャンクサイズ（バイト）
+    PARSE_PROCESSES = 0  # 店舗詳細ページを解析するプロセス数（0の場合は取得したスレッドで解析）
+    
+    # HTTP接続設定
+    HTTP_POOL_SIZE = 16  # ホストごとに保持するコネクション数
+    HTTP_POOL_CONNECTIONS = 4  # コネクションプールを保持するホスト数
+    DEFAULT_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'ja,en-US;q=0.7,en;q=0.3',
+        'Connection': 'keep-alive'
+    }
+    
+    # スクレイピングエンジン設定
+    SCRAPER_ENGINE = 'thread'  # 'thread'（スレッド）または 'async'（asyncio）
+    ASYNC_MAX_CONNECTIONS = 100  # 非同期エンジンの最大同時接続数
+    ASYNC_THROTTLE_POLL_INTERVAL = 0.05  # 非同期エンジンで接続枠の空きを確認する間隔（秒）
     
     # デフォルト値
     DEFAULT_MAX_PAGES = 50  # デフォルトの最大ページ数
@@ -29,12 +70,32 @@ class Settings:
     DEFAULT_SAVE_PATH = os.path.expanduser("~\\Downloads")  # デフォルトの保存先
     
     # キャッシュ設定
-    CACHE_NAME = 'tabelog_cache'
-    CACHE_EXPIRE_AFTER = 3600  # キャッシュ有効期限（秒）
+    CACHE_ENABLED = True  # ページキャッシュを使用するか
+    CACHE_NAME = 'tabelog_cache'  # キャッシュファイル名（拡張子.sqliteが付く）
+    LIST_CACHE_EXPIRE_AFTER = 3600  # 一覧ページのキャッシュ有効期限（秒）
+    DETAIL_CACHE_EXPIRE_AFTER = 14 * 24 * 3600  # 店舗詳細ページのキャッシュ有効期限（秒）
+    CACHE_MAX_SIZE = 500 * 1024 * 1024  # キャッシュの最大サイズ（バイト）
+    
+    # 店舗データベース設定
+    SHOP_STORE_ENABLED = True  # 取得した店舗を保存先フォルダのデータベースに蓄積するか
+    SHOP_STORE_NAME = 'tabelog_shops'  # データベースファイル名（拡張子.sqliteが付く）
+    DELTA_MODE = False  # 差分取得（店舗データベースで鮮度内の店舗は詳細ページを取得しない）を既定で使うか
+    DELTA_FRESHNESS_WINDOW = 7 * 24 * 3600  # 差分取得で再取得しない期間（秒）
+    
+    # チェックポイント設定
+    CHECKPOINT_ENABLED = True  # クロールの進行状況を保存先フォルダに保存し、中断したクロールを再開できるようにするか
+    CHECKPOINT_SUFFIX = '.checkpoint.json'  # チェックポイントファイルの接尾辞（出力ファイル名の拡張子と置き換える）
+    CHECKPOINT_INTERVAL = 30  # ページの確定を待たずに取得済みの店舗を保存する間隔（秒）
+    
+    # 出力設定
+    OUTPUT_FORMAT = 'xlsx'  # 'xlsx'、'csv'、'jsonl' または 'parquet'（pyarrowが必要）
+    PARTIAL_FILE_SUFFIX = '.partial'  # 書き込み途中のデータを追記するファイルの接尾辞（拡張子の前に付く）
+    PARQUET_ROW_GROUP_SIZE = 50000  # Parquetの行グループあたりの行数
     
     # Excel出力設定
     EXCEL_ENGINE = 'openpyxl'
     EXCEL_INDEX = False
+    EXCEL_SHEET_NAME = 'Sheet1'
     
     # 店舗情報フィールド
     SHOP_FIELDS = [
@@ -49,5 +110,8 @@ class Settings:
         'サービス'
     ]
     
+    # 出力項目の選択に関わらず必ず出力する項目
+    REQUIRED_FIELDS = ['店舗名', 'URL']
+    
     # デフォルト値（データがない場合）
     NO_DATA_VALUE = '記載なし'
\ No newline at end of file
@@ -8,6 +8,8 @@ from tkinter import ttk
 from .search_tab import SearchTab
 from .progress_tab import ProgressTab
 from scraping.scraper import Scraper
+from scraping.async_scraper import AsyncScraper
+from config import Settings
 
 
 class MainWindow:
@@ -51,15 +53,25 @@ class MainWindow:
         # 進行状況タブの準備
         self.progress_tab.on_start()
         
+        # エンジンの選択
+        self.scraper = self._create_scraper(search_params.get('engine', Settings.SCRAPER_ENGINE))
+        
         # スクレイピング実行
         self.scraper.start(
             search_params,
             progress_callback=self.progress_tab.update_progress,
             status_callback=self.progress_tab.update_status,
             log_callback=self.progress_tab.add_log,
-            complete_callback=self.on_scraping_complete
+            complete_callback=self.on_scraping_complete,
+            concurrency_callback=self.progress_tab.update_concurrency
         )
         
+    def _create_scraper(self, engine):
+        """エンジン名に応じたスクレイパーを生成"""
+        if engine == 'async':
+            return AsyncScraper()
+        return Scraper()
+        
     def stop_scraping(self):
         """スクレイピングを停止"""
         self.scraper.stop()
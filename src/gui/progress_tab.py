@@ -39,6 +39,10 @@ class ProgressTab:
         self.progress_label = ttk.Label(self.frame, text="進捗: 0/0 ページ")
         self.progress_label.pack(pady=5)
         
+        # 同時接続数・リクエストレート表示
+        self.concurrency_label = ttk.Label(self.frame, text="同時接続数: - / レート: - 件/秒")
+        self.concurrency_label.pack(pady=5)
+        
         # 停止ボタン
         self.stop_button = ttk.Button(
             self.frame, 
@@ -80,6 +84,10 @@ class ProgressTab:
             self.progress_var.set(0)
             self.progress_label.config(text="進捗: 0/0 ページ")
             
+    def update_concurrency(self, limit, rate):
+        """同時接続数とリクエストレートの表示を更新する"""
+        self.concurrency_label.config(text=f"同時接続数: {limit} / レート: {rate:.2f} 件/秒")
+        
     def update_status(self, text):
         """ステータスラベルを更新する"""
         self.status_label.config(text=text)
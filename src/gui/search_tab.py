@@ -9,6 +9,7 @@ from datetime import datetime
 
 from data import prefectures_values, prefectures_middle_category, prefectures_small_category
 from config import Settings
+from utils import available_formats
 
 
 class SearchTab:
@@ -59,6 +60,17 @@ class SearchTab:
         self.save_path_button = ttk.Button(save_frame, text="選択", command=self.choose_save_path)
         self.save_path_button.pack(side=tk.LEFT)
         
+        # 出力形式選択（必要なライブラリがない形式は表示しない）
+        format_frame = ttk.Frame(self.frame)
+        format_frame.pack(fill=tk.X, pady=5)
+        
+        format_label = ttk.Label(format_frame, text="出力形式:", width=15)
+        format_label.pack(side=tk.LEFT)
+        
+        self.format_combo = ttk.Combobox(format_frame, values=available_formats(), width=10, state="readonly")
+        self.format_combo.set(Settings.OUTPUT_FORMAT)
+        self.format_combo.pack(side=tk.LEFT)
+        
     def _create_area_widgets(self):
         """地域選択ウィジェットを作成"""
         # 都道府県選択
@@ -110,6 +122,22 @@ class SearchTab:
         self.start_page_entry.insert(0, str(Settings.DEFAULT_START_PAGE))
         self.start_page_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
+        # 同時取得数指定
+        workers_frame = ttk.Frame(self.frame)
+        workers_frame.pack(fill=tk.X, pady=5)
+        
+        workers_label = ttk.Label(workers_frame, text="同時取得数:", width=15)
+        workers_label.pack(side=tk.LEFT)
+        
+        self.workers_spinbox = ttk.Spinbox(
+            workers_frame, 
+            from_=1, 
+            to=Settings.MAX_DETAIL_WORKERS, 
+            width=10
+        )
+        self.workers_spinbox.set(Settings.DETAIL_WORKERS)
+        self.workers_spinbox.pack(side=tk.LEFT)
+        
         # チェックボックスオプション
         options_frame = ttk.Frame(self.frame)
         options_frame.pack(fill=tk.X, pady=10)
@@ -120,7 +148,20 @@ class SearchTab:
         
         self.new_open_var = tk.BooleanVar(value=False)
         self.new_open_check = ttk.Checkbutton(options_frame, text="ニューオープンモード", variable=self.new_open_var)
-        self.new_open_check.pack(side=tk.LEFT)
+        self.new_open_check.pack(side=tk.LEFT, padx=(0, 20))
+        
+        self.async_engine_var = tk.BooleanVar(value=Settings.SCRAPER_ENGINE == 'async')
+        self.async_engine_check = ttk.Checkbutton(options_frame, text="非同期エンジン", variable=self.async_engine_var)
+        self.async_engine_check.pack(side=tk.LEFT, padx=(0, 20))
+        
+        self.delta_mode_var = tk.BooleanVar(value=Settings.DELTA_MODE)
+        self.delta_mode_check = ttk.Checkbutton(options_frame, text="差分取得", variable=self.delta_mode_var)
+        self.delta_mode_check.pack(side=tk.LEFT, padx=(0, 20))
+        
+        # 保存先フォルダのチェックポイントから、前回停止・中断したクロールを続ける
+        self.resume_var = tk.BooleanVar(value=False)
+        self.resume_check = ttk.Checkbutton(options_frame, text="前回の続きから再開", variable=self.resume_var)
+        self.resume_check.pack(side=tk.LEFT)
         
         # オープン日フィルタ
         date_frame = ttk.Frame(self.frame)
@@ -148,6 +189,26 @@ class SearchTab:
         month_label = ttk.Label(date_frame, text="月")
         month_label.pack(side=tk.LEFT)
         
+        # 出力項目
+        fields_frame = ttk.Frame(self.frame)
+        fields_frame.pack(fill=tk.X, pady=5)
+        
+        fields_label = ttk.Label(fields_frame, text="出力項目:", width=15)
+        fields_label.pack(side=tk.LEFT, anchor=tk.N)
+        
+        fields_check_frame = ttk.Frame(fields_frame)
+        fields_check_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        # 店舗名・URLは常に出力するため選択できない
+        self.field_vars = {}
+        self.field_checks = {}
+        for index, field in enumerate(Settings.SHOP_FIELDS):
+            self.field_vars[field] = tk.BooleanVar(value=True)
+            self.field_checks[field] = ttk.Checkbutton(fields_check_frame, text=field, variable=self.field_vars[field])
+            self.field_checks[field].grid(row=index // 5, column=index % 5, sticky=tk.W, padx=(0, 10))
+            if field in Settings.REQUIRED_FIELDS:
+                self.field_checks[field].configure(state="disabled")
+        
     def _create_action_buttons(self):
         """アクションボタンを作成"""
         button_frame = ttk.Frame(self.frame)
@@ -160,15 +221,19 @@ class SearchTab:
         """ヘルプテキストを作成"""
         help_text = """
         使用方法：
-        1. 保存先フォルダを選択（デフォルト：ダウンロードフォルダ）
+        1. 保存先フォルダと出力形式を選択（デフォルト：ダウンロードフォルダ、Excel形式）
         2. 対象の都道府県を選択（「全国」でも可）
         3. 必要に応じて地域（中項目・小項目）を選択
-        4. 開始ページを指定（省略時は1）
+        4. 開始ページと同時取得数を指定（省略時は1ページ目から4並列）
         5. オプションを設定
           - 50ページ区切り：ONにすると最大50ページまでスクレイピング
           - ニューオープンモード：新規オープン店舗のみをスクレイピング
+          - 非同期エンジン：asyncioで多数のリクエストを並行処理
+          - 差分取得：以前に取得した店舗は詳細ページを取得せず、新しい店舗のみ取得
+          - 前回の続きから再開：同じ検索条件で停止・中断したクロールを、保存先フォルダの進行状況から続ける
         6. オープン日でフィルタリング（年/月を指定可能）
-        7. 「スクレイピング開始」ボタンをクリック
+        7. 出力する項目を選択（選択しない項目は取得を省略）
+        8. 「スクレイピング開始」ボタンをクリック
         
         結果は指定したフォルダに保存されます。
         """
@@ -231,14 +296,20 @@ class SearchTab:
         # 検索パラメータを収集
         search_params = {
             'save_path': self.save_path_var.get(),
+            'output_format': self.format_combo.get(),
             'prefecture': self.prefecture_combo.get(),
             'middle': self.middle_combo.get(),
             'small': self.small_combo.get(),
             'start_page': int(self.start_page_entry.get()) if self.start_page_entry.get() else 1,
+            'detail_workers': int(self.workers_spinbox.get()) if self.workers_spinbox.get() else Settings.DETAIL_WORKERS,
             'fifty_page_mode': self.fifty_page_var.get(),
             'new_open_mode': self.new_open_var.get(),
+            'engine': 'async' if self.async_engine_var.get() else 'thread',
+            'delta_mode': self.delta_mode_var.get(),
+            'resume': self.resume_var.get(),
             'filter_year': self.year_combo.get(),
-            'filter_month': self.month_combo.get()
+            'filter_month': self.month_combo.get(),
+            'output_fields': [field for field, var in self.field_vars.items() if var.get()]
         }
         
         # コントロールを無効化
@@ -251,24 +322,39 @@ class SearchTab:
         """コントロールを無効化"""
         self.start_button.configure(state="disabled")
         self.save_path_button.configure(state="disabled")
+        self.format_combo.configure(state="disabled")
         self.prefecture_combo.configure(state="disabled")
         self.middle_combo.configure(state="disabled")
         self.small_combo.configure(state="disabled")
         self.start_page_entry.configure(state="disabled")
+        self.workers_spinbox.configure(state="disabled")
         self.fifty_page_check.configure(state="disabled")
         self.new_open_check.configure(state="disabled")
+        self.async_engine_check.configure(state="disabled")
+        self.delta_mode_check.configure(state="disabled")
+        self.resume_check.configure(state="disabled")
         self.year_combo.configure(state="disabled")
         self.month_combo.configure(state="disabled")
+        for check in self.field_checks.values():
+            check.configure(state="disabled")
         
     def enable_controls(self):
         """コントロールを有効化"""
         self.start_button.configure(state="normal")
         self.save_path_button.configure(state="normal")
+        self.format_combo.configure(state="readonly")
         self.prefecture_combo.configure(state="readonly")
         self.middle_combo.configure(state="readonly")
         self.small_combo.configure(state="readonly")
         self.start_page_entry.configure(state="normal")
+        self.workers_spinbox.configure(state="normal")
         self.fifty_page_check.configure(state="normal")
         self.new_open_check.configure(state="normal")
+        self.async_engine_check.configure(state="normal")
+        self.delta_mode_check.configure(state="normal")
+        self.resume_check.configure(state="normal")
         self.year_combo.configure(state="readonly")
-        self.month_combo.configure(state="readonly")
\ No newline at end of file
+        self.month_combo.configure(state="readonly")
+        for field, check in self.field_checks.items():
+            if field not in Settings.REQUIRED_FIELDS:
+                check.configure(state="normal")
\ No newline at end of file
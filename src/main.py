@@ -4,9 +4,9 @@
 食べログスクレイピングツール - メインエントリーポイント
 """
 
+import multiprocessing
 import os
 import sys
-import requests_cache
 
 # 環境変数設定
 os.environ['TK_SILENCE_DEPRECATION'] = '1'
@@ -17,13 +17,12 @@ from gui.main_window import MainWindow
 
 def main():
     """メイン関数"""
-    # キャッシュの設定
-    requests_cache.install_cache('tabelog_cache', expire_after=3600)
-    
     # GUIアプリケーションの起動
     app = MainWindow()
     app.run()
 
 
 if __name__ == "__main__":
+    # 実行ファイル化した環境で解析用プロセスを起動できるようにする
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
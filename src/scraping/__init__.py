@@ -3,7 +3,9 @@
 """
 
 from .scraper import Scraper
+from .async_scraper import AsyncScraper
 from .url_builder import URLBuilder
 from .parser import Parser
+from .http_client import HttpClient
 
-__all__ = ['Scraper', 'URLBuilder', 'Parser']
\ No newline at end of file
+__all__ = ['Scraper', 'AsyncScraper', 'URLBuilder', 'Parser', 'HttpClient']
\ No newline at end of file
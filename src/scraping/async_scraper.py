@@ -0,0 +1,358 @@
+"""
+非同期スクレイピング機能（asyncioエンジン）
+"""
+
+import asyncio
+import aiohttp
+from functools import partial
+
+from .scraper import Scraper
+from .http_client import declared_encoding, revalidation_headers
+from .parser import Parser, RegexExtractor, parse_detail_page
+from .rate_limiter import RateLimiter
+from .retry_scheduler import RetryScheduler
+from .page_cache import PageCache
+from config import Settings
+
+
+class AsyncScraper(Scraper):
+    """asyncioベースのスクレイパークラス
+    
+    Scraperと同じ検索パラメータ・コールバックを受け取り、
+    1つのイベントループ上で多数のリクエストを並行して処理する。
+    """
+    
+    def _scrape(self, search_params):
+        """イベントループを起動してスクレイピングを実行（スクレイピング用スレッドで実行）"""
+        try:
+            asyncio.run(self.run(search_params))
+        finally:
+            if self.complete_callback:
+                self.complete_callback()
+                
+    async def run(self, search_params):
+        """
+        スクレイピングを実行するコルーチン
+        
+        既存のイベントループ上で複数の地域を同時にクロールする場合は、
+        AsyncScraperを地域ごとに作成してこのコルーチンをgatherする。
+        
+        Args:
+            search_params (dict): 検索パラメータ
+        """
+        try:
+            self._update_status("スクレイピングの準備中...")
+            self._add_log("スクレイピングを開始します（非同期エンジン）")
+            
+            # 中断したクロールを再開する場合は、同じ検索条件のチェックポイントを探す
+            resume = self._load_resume(search_params)
+            self.search_params = search_params
+            self.resumed_records = {}
+            
+            # パラメータの解析
+            params = self._parse_params(search_params)
+            if resume:
+                self._resume_params(params, resume)
+                
+            # URL生成
+            current_url = self._build_page_url(params, params['start_page'])
+            
+            self._update_status(f"スクレイピング開始: {current_url}")
+            self._add_log(f"URL: {current_url}")
+            
+            connector = aiohttp.TCPConnector(limit=Settings.ASYNC_MAX_CONNECTIONS)
+            timeout = aiohttp.ClientTimeout(total=Settings.REQUEST_TIMEOUT)
+            semaphore = asyncio.Semaphore(params['max_workers'])
+            self.rate_limiter = RateLimiter(Settings.REQUESTS_PER_SECOND, Settings.RATE_LIMIT_BURST)
+            self.throttle = self._create_throttle(self.rate_limiter, params)
+            self.retry_scheduler = RetryScheduler()
+            self.page_cache = PageCache() if Settings.CACHE_ENABLED else None
+            self.parse_pool = self._create_parse_pool()
+            RegexExtractor.reset_stats()
+            # 取得はaiohttpで行うため、パーサーは本文の解析のみに使う
+            self.parser = Parser(fields=params['output_fields'], filters=self._build_filters(params))
+            self._open_output(search_params, params, resume)
+            self.checkpoint = self._create_checkpoint()
+            self.shop_store = self._create_shop_store(search_params)
+            self.reused_count = 0
+            loop = asyncio.get_running_loop()
+            
+            page_count = params['start_page']
+            pages_scraped = 0
+            
+            async with aiohttp.ClientSession(
+                connector=connector, 
+                timeout=timeout, 
+                headers=Settings.DEFAULT_HEADERS
+            ) as session:
+                while current_url and page_count <= params['end_page'] and not self.stop_flag:
+                    self._update_status(f"スクレイピング中: ページ {page_count}/{params['end_page']}")
+                    self._update_progress(
+                        params['pages_done'] + pages_scraped + 1, params['pages_done'] + params['max_pages']
+                    )
+                    self._add_log(f"ページ {page_count} をスクレイピング中: {current_url}")
+                    
+                    # ページのスクレイピング
+                    page_data, fetched_data, next_url = await self._scrape_page_async(
+                        session, semaphore, current_url, params
+                    )
+                    
+                    if self.stop_flag:
+                        # 取得の途中で停止したページは確定せず、取得済みの店舗を再開用に保存
+                        await loop.run_in_executor(None, self._save_checkpoint, page_count, fetched_data or [])
+                        break
+                        
+                    # 一覧ページの取得に失敗した場合・店舗がない場合は終了
+                    if page_data is None:
+                        break
+                        
+                    # フィルタで全店舗が除外されたページも確定して次のページへ進む
+                    # （ファイル書き込みはイベントループを止めないよう別スレッドで行う）
+                    await loop.run_in_executor(None, self.output_writer.write_rows, page_data)
+                    await loop.run_in_executor(None, self._save_checkpoint, page_count + 1)
+                    pages_scraped += 1
+                    
+                    # 最大ページ数に達したかチェック
+                    if pages_scraped >= params['max_pages']:
+                        self._add_log(f"最大ページ数({params['max_pages']}ページ)に達しました。")
+                        break
+                        
+                    # 次のページへ
+                    if next_url:
+                        current_url = next_url
+                        page_count += 1
+                    else:
+                        self._add_log("次のページはありません。")
+                        break
+                        
+            # リトライ上限に達したURLを報告
+            self._report_failures()
+            self._report_hit_rates()
+            self._report_reused()
+            
+            # 結果の保存（停止した場合も確定済みのページまでを保存する。ファイル書き込みは別スレッドで行う）
+            row_count = self.output_writer.row_count
+            if self.stop_flag:
+                await loop.run_in_executor(None, self._save_stopped, row_count)
+            elif row_count:
+                await loop.run_in_executor(None, self._save_results, row_count)
+            else:
+                self._update_status("データが取得できませんでした。")
+                self._add_log("データが取得できませんでした。")
+                self._remove_checkpoint()
+                
+        except Exception as e:
+            self._add_log(f"エラーが発生しました: {e}")
+            self._update_status(f"エラーが発生しました: {e}")
+            
+        finally:
+            self._close_output()
+            if self.shop_store:
+                self.shop_store.close()
+            if self.retry_scheduler:
+                self.retry_scheduler.stop()
+            if self.page_cache:
+                self.page_cache.close()
+            if self.parse_pool:
+                self.parse_pool.shutdown()
+                
+    async def _scrape_page_async(self, session, semaphore, url, params):
+        """
+        1ページをスクレイピング
+        
+        Returns:
+            tuple: (出力する店舗情報, 詳細ページを取得した店舗の解析結果（フィルタで除外された店舗を含む）, 次ページのURL)
+                   一覧ページの取得に失敗した場合・店舗がない場合は出力する店舗情報がNone
+        """
+        soup = await self._fetch_list_page_async(session, url)
+        if soup is None:
+            return None, None, None
+            
+        # 店舗リストを取得
+        shop_list = soup.find_all('div', class_='list-rst')
+        
+        if not shop_list:
+            self._add_log("このページには店舗がありません。")
+            return None, None, None
+            
+        self._add_log(f"ページで {len(shop_list)} 件の店舗を発見")
+        
+        # 店舗詳細ページを並行に取得（gatherは一覧ページの順序を維持する）
+        parser = self.parser
+        shop_urls = self._select_cards(self._extract_shop_cards(shop_list, params), params)
+        
+        # 再開前に取得済みの店舗はその店舗情報を、差分取得で鮮度内の店舗は店舗データベースの情報を使い、詳細ページを取得しない
+        # （店舗データベースの検索はイベントループを止めないよう別スレッドでまとめて行う）
+        loop = asyncio.get_running_loop()
+        resumed = [self.resumed_records.pop(shop_url, None) for shop_url in shop_urls]
+        stored = await loop.run_in_executor(None, lambda: [
+            self._find_stored(parser, shop_url, params) if resumed_record is None else None
+            for shop_url, resumed_record in zip(shop_urls, resumed)
+        ])
+        fetched = iter(await asyncio.gather(*[
+            self._fetch_shop_details_async(session, semaphore, parser, shop_url)
+            for shop_url, resumed_record, record in zip(shop_urls, resumed, stored)
+            if resumed_record is None and record is None
+        ]))
+        
+        page_data = []
+        fetched_data = []
+        for resumed_record, record in zip(resumed, stored):
+            if record is not None:
+                shop_record = record
+            elif resumed_record is not None:
+                shop_record = resumed_record
+            else:
+                shop_record = next(fetched)
+            if shop_record is None:
+                continue
+                
+            # 詳細ページを取得した店舗は、フィルタで除外された場合も差分取得で再取得しないよう登録する
+            if record is None:
+                fetched_data.append(shop_record)
+                
+            # オープン日でフィルタリング
+            shop_data = parser.finish(shop_record)
+            if shop_data is not None and self._filter_shop(shop_data, params):
+                page_data.append(shop_data)
+                    
+        # 取得した店舗を店舗データベースに登録（ファイル書き込みは別スレッドで行う）
+        await loop.run_in_executor(None, self._store_shops, fetched_data)
+        
+        # 次のページURLを取得
+        next_url = self._extract_next_url(soup)
+        
+        return page_data, fetched_data, next_url
+        
+    async def _fetch_list_page_async(self, session, url):
+        """一覧ページを取得して解析（失敗時はバックオフ付きでリトライ）"""
+        attempt = 0
+        while not self.stop_flag:
+            attempt += 1
+            try:
+                body, encoding, _ = await self._fetch_bytes(session, url)
+                return self._parse_list_page(body, encoding)
+                
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._add_log(f'エラーが発生しました: {e}')
+                if attempt >= Settings.MAX_RETRIES:
+                    self.retry_scheduler.add_failure(url, e)
+                    return None
+                await asyncio.sleep(self.retry_scheduler.backoff(attempt))
+        return None
+        
+    async def _fetch_shop_details_async(self, session, semaphore, parser, shop_url):
+        """店舗詳細ページの解析結果を取得（リトライ待機中は接続枠を解放する。フィルタは呼び出し側で適用）"""
+        loop = asyncio.get_running_loop()
+        for attempt in range(1, Settings.MAX_RETRIES + 1):
+            if self.stop_flag:
+                return None
+                
+            try:
+                async with semaphore:
+                    body, encoding, cached_record = await self._fetch_bytes(session, shop_url)
+                    
+                # キャッシュ済み（304を含む）の解析結果で足りる場合は解析を省略
+                if cached_record is not None and parser.covers(cached_record):
+                    return {'URL': shop_url, **cached_record}
+                    
+                # 解析用プロセスがある場合はイベントループを止めずに解析する
+                if self.parse_pool:
+                    shop_data = await loop.run_in_executor(
+                        self.parse_pool, parse_detail_page, body, encoding, shop_url,
+                        parser.backend, parser.fields, parser.filters
+                    )
+                else:
+                    shop_data = parser.parse_html(body, shop_url, encoding=encoding)
+                    
+                # 一部の項目だけを抽出した場合も、以前の解析結果に追加して保存する（スレッドエンジンと共有）
+                if self.page_cache:
+                    await loop.run_in_executor(
+                        None, self.page_cache.set_record, shop_url, {**(cached_record or {}), **shop_data}
+                    )
+                return {'URL': shop_url, **shop_data}
+                
+            except (aiohttp.ClientError, asyncio.TimeoutError, AttributeError) as e:
+                self._add_log(f"{shop_url} でエラーが発生しました: {e}")
+                if attempt >= Settings.MAX_RETRIES:
+                    self.retry_scheduler.add_failure(shop_url, e)
+                    return None
+                await asyncio.sleep(self.retry_scheduler.backoff(attempt))
+            except Exception as e:
+                # 空の本文など解析できないページは、空の行にせず取得失敗として記録する
+                self._add_log(f"{shop_url} の取得でエラーが発生しました: {e}")
+                self.retry_scheduler.add_failure(shop_url, e)
+                return None
+                
+        return None
+        
+    async def _fetch_bytes(self, session, url):
+        """
+        URLの本文を取得
+        
+        期限切れのキャッシュはHttpClientと同じく検証子を付けて再検証し、
+        304の場合はキャッシュ済みの本文と解析結果を使い回す。
+        
+        Returns:
+            tuple: (本文のバイト列, 文字コード, キャッシュ済みの解析結果（ない場合はNone）)
+        """
+        # キャッシュの読み書きはSQLiteへの問い合わせのため、イベントループを止めないよう別スレッドで行う
+        loop = asyncio.get_running_loop()
+        
+        # 途中で打ち切った本文は使わない（非同期エンジンは本文全体を受信する）
+        entry = await loop.run_in_executor(None, self.page_cache.lookup, url) if self.page_cache else None
+        if entry and not entry.complete:
+            entry = None
+            
+        # 有効期限内のキャッシュがある場合は同時接続数・レート制限の対象外
+        if entry and entry.fresh:
+            return entry.body, entry.encoding, entry.record
+            
+        # 同時接続数の枠を確保（イベントループを止めないよう非同期に待機）
+        if self.throttle:
+            while not self.throttle.try_acquire():
+                await asyncio.sleep(Settings.ASYNC_THROTTLE_POLL_INTERVAL)
+        try:
+            # レート制限
+            wait_time = self.rate_limiter.reserve()
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+                
+            started_at = loop.time()
+            try:
+                # 期限切れのキャッシュは検証子を付けて再検証する
+                headers = revalidation_headers(entry) if entry else None
+                async with session.get(url, headers=headers) as response:
+                    if self.throttle:
+                        self.throttle.record_response(
+                            response.status,
+                            loop.time() - started_at,
+                            response.headers.get('Retry-After')
+                        )
+                        
+                    # 変更がなければキャッシュ済みの本文と解析結果を使い回す
+                    if response.status == 304 and entry:
+                        await loop.run_in_executor(None, self.page_cache.touch, url)
+                        return entry.body, entry.encoding, entry.record
+                        
+                    response.raise_for_status()
+                    body = await response.read()
+                    # get_encoding()は宣言がないと本文全体から文字コードを推定するため使わない
+                    encoding = declared_encoding(response.headers.get('Content-Type'), body)
+                    if self.page_cache:
+                        await loop.run_in_executor(None, partial(
+                            self.page_cache.set,
+                            url,
+                            body,
+                            encoding,
+                            etag=response.headers.get('ETag'),
+                            last_modified=response.headers.get('Last-Modified')
+                        ))
+                    return body, encoding, None
+            except asyncio.TimeoutError:
+                if self.throttle:
+                    self.throttle.record_timeout()
+                raise
+        finally:
+            if self.throttle:
+                self.throttle.release()
\ No newline at end of file
@@ -0,0 +1,243 @@
+"""
+HTTP通信機能
+"""
+
+import codecs
+import re
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+
+from config import Settings
+
+
+# Content-Typeヘッダーのcharset指定と、本文先頭のmeta要素での文字コード宣言
+CHARSET_PATTERN = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+# meta要素の文字コード宣言を探す範囲（HTMLの仕様と同じく先頭1024バイト）
+META_SNIFF_BYTES = 1024
+
+
+def declared_encoding(content_type, head=b''):
+    """
+    レスポンスで宣言された文字コードを返す
+    
+    requests・aiohttpは宣言がない場合に本文全体から文字コードを推定するため、
+    推定は行わずにヘッダー・meta要素の宣言だけを見る（宣言がなければUTF-8）。
+    
+    Args:
+        content_type (str): Content-Typeヘッダーの値
+        head (bytes): 本文の先頭部分
+        
+    Returns:
+        str: 正規化した文字コード名（例: 'utf-8'、'shift_jis'）
+    """
+    for match in (CHARSET_PATTERN.search(content_type or ''), META_CHARSET_PATTERN.search(head[:META_SNIFF_BYTES])):
+        if not match:
+            continue
+        name = match.group(1)
+        if isinstance(name, bytes):
+            name = name.decode('ascii')
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            continue
+    return 'utf-8'
+
+
+def revalidation_headers(entry):
+    """
+    期限切れのキャッシュを再検証する条件付きリクエストのヘッダーを返す
+    
+    Args:
+        entry (CachedPage): キャッシュ
+        
+    Returns:
+        dict: If-None-Match・If-Modified-Sinceヘッダー（検証子がない場合は空）
+    """
+    headers = {}
+    if entry.etag:
+        headers['If-None-Match'] = entry.etag
+    if entry.last_modified:
+        headers['If-Modified-Since'] = entry.last_modified
+    return headers
+
+
+class HttpClient:
+    """HTTPクライアントクラス（コネクションプール付きセッション）"""
+    
+    def __init__(self, pool_size=None, headers=None, rate_limiter=None, throttle=None, cache=None):
+        """
+        Args:
+            pool_size (int): ホストごとに保持するコネクション数
+            headers (dict): 全リクエストに付与するヘッダー
+            rate_limiter (RateLimiter): 共有するレート制限（Noneの場合は制限なし）
+            throttle (AdaptiveThrottle): 同時接続数の自動調整（Noneの場合は調整なし）
+            cache (PageCache): ページキャッシュ（Noneの場合はキャッシュなし）
+        """
+        self.pool_size = pool_size or Settings.HTTP_POOL_SIZE
+        self.rate_limiter = rate_limiter
+        self.throttle = throttle
+        self.cache = cache
+        
+        # Keep-Aliveで接続を使い回すセッション
+        self.session = requests.Session()
+        self.session.headers.update(Settings.DEFAULT_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+            
+        adapter = HTTPAdapter(
+            pool_connections=Settings.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=self.pool_size
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+    def get(self, url, **kwargs):
+        """GETリクエストを送信"""
+        return self._request(url, None, **kwargs)
+        
+    def stream(self, url, feed, chunk_size=None, refresh=False, **kwargs):
+        """
+        GETリクエストの本文を分割して受信する
+        
+        受信したチャンクごとに feed(chunk, encoding) を呼び出し、Trueが返された時点で
+        残りの受信を打ち切る。打ち切った本文は不完全なものとしてキャッシュされる。
+        キャッシュから返す場合（from_cache=True）はfeedを呼び出さない。
+        
+        Args:
+            url (str): 取得するURL
+            feed (callable): チャンクを受け取り、受信を打ち切る場合にTrueを返す関数
+            chunk_size (int): チャンクサイズ（バイト）
+            refresh (bool): キャッシュを使わずに取得し直す（キャッシュの本文で項目が揃わない場合）
+            
+        Returns:
+            requests.Response: 受信済みの本文を持つレスポンス（truncated: 打ち切ったかどうか）
+        """
+        return self._request(url, feed, chunk_size or Settings.STREAM_CHUNK_SIZE, refresh, **kwargs)
+        
+    def _request(self, url, feed, chunk_size=None, refresh=False, **kwargs):
+        """キャッシュ・同時接続数・レート制限を考慮してGETリクエストを送信"""
+        kwargs.setdefault('timeout', Settings.REQUEST_TIMEOUT)
+        
+        # 途中で打ち切った本文は、同じく打ち切って使う分割受信にしか使わない
+        entry = self.cache.lookup(url) if self.cache and not refresh else None
+        if entry and not entry.complete and feed is None:
+            entry = None
+            
+        # 有効期限内のキャッシュがある場合はレート制限の対象外
+        if entry and entry.fresh:
+            return self._cached_response(url, entry)
+            
+        # 期限切れのキャッシュは検証子を付けて再検証する
+        if entry:
+            kwargs['headers'] = {**(kwargs.pop('headers', None) or {}), **revalidation_headers(entry)}
+            
+        # 同時接続数の枠とレート制限のトークンを取得してから送信
+        if self.throttle:
+            self.throttle.acquire()
+        try:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+                
+            started_at = time.monotonic()
+            try:
+                response = self.session.get(url, stream=feed is not None, **kwargs)
+            except requests.exceptions.Timeout:
+                if self.throttle:
+                    self.throttle.record_timeout()
+                raise
+                
+            if self.throttle:
+                self.throttle.record_response(
+                    response.status_code,
+                    time.monotonic() - started_at,
+                    response.headers.get('Retry-After')
+                )
+                
+            # 変更がなければキャッシュ済みの本文と解析結果を使い回す
+            if self.cache and response.status_code == 304 and entry:
+                response.close()
+                self.cache.touch(url)
+                return self._cached_response(url, entry)
+                
+            complete = True
+            if feed is not None:
+                try:
+                    complete = self._read_stream(response, feed, chunk_size)
+                except requests.exceptions.ConnectionError as e:
+                    # 受信中のタイムアウトはConnectionErrorとして送出されるため、ここで同時接続数に反映する
+                    if self.throttle and e.args and isinstance(e.args[0], ReadTimeoutError):
+                        self.throttle.record_timeout()
+                    raise
+            else:
+                # response.textでの文字コード推定を避けるため、宣言された文字コードを設定しておく
+                response.encoding = declared_encoding(response.headers.get('Content-Type'), response.content)
+            response.truncated = not complete
+            
+            if self.cache and response.status_code == 200:
+                self.cache.set(
+                    url,
+                    response.content,
+                    response.encoding,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified'),
+                    complete=complete
+                )
+            return response
+        finally:
+            if self.throttle:
+                self.throttle.release()
+                
+    def _read_stream(self, response, feed, chunk_size):
+        """
+        本文をチャンクごとにfeedへ渡しながら受信する
+        
+        Returns:
+            bool: 本文を最後まで受信した場合はTrue、途中で打ち切った場合はFalse
+        """
+        # エラー応答は解析しないため、全体を読み込んで接続をプールに戻す
+        if response.status_code != 200:
+            response.content
+            return True
+            
+        chunks = []
+        complete = True
+        try:
+            for chunk in response.iter_content(chunk_size):
+                if not chunks:
+                    response.encoding = declared_encoding(response.headers.get('Content-Type'), chunk)
+                chunks.append(chunk)
+                if feed(chunk, response.encoding):
+                    complete = False
+                    break
+        finally:
+            # 打ち切った接続は再利用できないため閉じる（最後まで受信した接続はプールに戻り済み）
+            response.close()
+        response._content = b''.join(chunks)
+        return complete
+        
+    def save_record(self, url, record):
+        """ページから解析したデータをキャッシュに保存（304時に再利用される）"""
+        if self.cache:
+            self.cache.set_record(url, record)
+            
+    def _cached_response(self, url, entry):
+        """キャッシュからレスポンスを生成"""
+        response = requests.models.Response()
+        response.url = url
+        response.status_code = 200
+        response._content = entry.body
+        response.encoding = entry.encoding
+        response.from_cache = True
+        response.cached_record = entry.record
+        response.truncated = not entry.complete
+        return response
+        
+    def close(self):
+        """セッションとキャッシュを閉じる"""
+        self.session.close()
+        if self.cache:
+            self.cache.close()
\ No newline at end of file
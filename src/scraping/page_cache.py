@@ -0,0 +1,189 @@
+"""
+ページキャッシュ機能
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from config import Settings
+
+
+# キャッシュの1件分（fresh: 有効期限内かどうか、record: 解析済みの店舗データ、
+# complete: 本文を最後まで受信したかどうか）
+CachedPage = namedtuple('CachedPage', ['body', 'encoding', 'etag', 'last_modified', 'record', 'fresh', 'complete'])
+
+
+class PageCache:
+    """SQLiteを使ったページキャッシュクラス
+    
+    一覧ページと店舗詳細ページで有効期限を分けて管理し、
+    合計サイズが上限を超えた場合は最後に参照された時刻が古いものから削除する。
+    """
+    
+    LIST = 'list'
+    DETAIL = 'detail'
+    
+    # 店舗詳細ページのURL（末尾が店舗ID）
+    DETAIL_URL_PATTERN = re.compile(r'/\d{7,}/?$')
+    
+    # 古いキャッシュファイルに追加する列
+    MIGRATED_COLUMNS = {
+        'etag': 'TEXT',
+        'last_modified': 'TEXT',
+        'record': 'TEXT',
+        'complete': 'INTEGER NOT NULL DEFAULT 1'
+    }
+    
+    def __init__(self, path=None, list_expire_after=None, detail_expire_after=None, max_size=None):
+        """
+        Args:
+            path (str): キャッシュファイルのパス
+            list_expire_after (int): 一覧ページの有効期限（秒）
+            detail_expire_after (int): 店舗詳細ページの有効期限（秒）
+            max_size (int): キャッシュの最大サイズ（バイト）
+        """
+        self.path = path or f"{Settings.CACHE_NAME}.sqlite"
+        self.expire_after = {
+            self.LIST: list_expire_after or Settings.LIST_CACHE_EXPIRE_AFTER,
+            self.DETAIL: detail_expire_after or Settings.DETAIL_CACHE_EXPIRE_AFTER
+        }
+        self.max_size = max_size or Settings.CACHE_MAX_SIZE
+        self.lock = threading.Lock()
+        
+        # 複数のワーカーから共有するため、WALモードで1つの接続を使い回す
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute('PRAGMA busy_timeout=5000')
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                body BLOB NOT NULL,
+                encoding TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                record TEXT,
+                complete INTEGER NOT NULL DEFAULT 1
+            )
+        """)
+        self._migrate()
+        self.connection.execute('CREATE INDEX IF NOT EXISTS idx_pages_accessed_at ON pages (accessed_at)')
+        self.connection.commit()
+        
+        self.total_size = self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM pages').fetchone()[0]
+        
+    @classmethod
+    def classify(cls, url):
+        """URLから種別（一覧ページ/店舗詳細ページ）を判定"""
+        return cls.DETAIL if cls.DETAIL_URL_PATTERN.search(url) else cls.LIST
+        
+    def get(self, url):
+        """
+        有効期限内で本文が揃っているキャッシュを取得する
+        
+        Returns:
+            CachedPage: キャッシュ（ない場合・期限切れの場合・途中で受信を打ち切った場合はNone）
+        """
+        entry = self.lookup(url)
+        return entry if entry and entry.fresh and entry.complete else None
+        
+    def lookup(self, url):
+        """
+        有効期限に関係なくキャッシュを取得する（再検証用）
+        
+        Returns:
+            CachedPage: キャッシュ（ない場合はNone）
+        """
+        now = time.time()
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT kind, body, encoding, fetched_at, etag, last_modified, record, complete '
+                'FROM pages WHERE url = ?', (url,)
+            ).fetchone()
+            if row is None:
+                return None
+                
+            kind, body, encoding, fetched_at, etag, last_modified, record, complete = row
+            fresh = now - fetched_at <= self.expire_after[kind]
+            if fresh:
+                self.connection.execute('UPDATE pages SET accessed_at = ? WHERE url = ?', (now, url))
+                self.connection.commit()
+                
+        return CachedPage(
+            body, encoding, etag, last_modified,
+            json.loads(record) if record else None,
+            fresh,
+            bool(complete)
+        )
+        
+    def set(self, url, body, encoding=None, etag=None, last_modified=None, complete=True):
+        """
+        ページをキャッシュに保存する（解析済みの店舗データは破棄される）
+        
+        Args:
+            complete (bool): 本文を最後まで受信したか（Falseの場合はget()で返さない）
+        """
+        now = time.time()
+        kind = self.classify(url)
+        with self.lock:
+            row = self.connection.execute('SELECT size FROM pages WHERE url = ?', (url,)).fetchone()
+            self.connection.execute(
+                'INSERT OR REPLACE INTO pages '
+                '(url, kind, body, encoding, fetched_at, accessed_at, size, etag, last_modified, record, complete) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, ?)',
+                (url, kind, body, encoding, now, now, len(body), etag, last_modified, int(complete))
+            )
+            self.total_size += len(body) - (row[0] if row else 0)
+            if self.total_size > self.max_size:
+                self._evict()
+            self.connection.commit()
+            
+    def touch(self, url):
+        """304 Not Modified の応答を受けたページの有効期限を延長する"""
+        now = time.time()
+        with self.lock:
+            self.connection.execute(
+                'UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?', (now, now, url)
+            )
+            self.connection.commit()
+            
+    def set_record(self, url, record):
+        """ページから解析した店舗データを保存する"""
+        with self.lock:
+            self.connection.execute(
+                'UPDATE pages SET record = ? WHERE url = ?',
+                (json.dumps(record, ensure_ascii=False), url)
+            )
+            self.connection.commit()
+            
+    def close(self):
+        """キャッシュを閉じる"""
+        with self.lock:
+            self.connection.close()
+            
+    def _migrate(self):
+        """古いキャッシュファイルに再検証用・受信状態の列を追加"""
+        columns = {row[1] for row in self.connection.execute('PRAGMA table_info(pages)')}
+        for column, column_type in self.MIGRATED_COLUMNS.items():
+            if column not in columns:
+                self.connection.execute(f'ALTER TABLE pages ADD COLUMN {column} {column_type}')
+                
+    def _evict(self):
+        """参照が古いページから削除して上限の9割まで減らす"""
+        target_size = self.max_size * 0.9
+        rows = self.connection.execute('SELECT url, size FROM pages ORDER BY accessed_at')
+        evicted = []
+        for url, size in rows:
+            if self.total_size <= target_size:
+                break
+            evicted.append((url,))
+            self.total_size -= size
+        self.connection.executemany('DELETE FROM pages WHERE url = ?', evicted)
\ No newline at end of file
@@ -2,56 +2,194 @@
 HTML解析機能
 """
 
-import time
+import json
+import re
+import threading
+from html import unescape
+
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+from lxml import html as lxml_html
 
+from .http_client import HttpClient, declared_encoding
 from config import Settings
 
 
+def class_strainer(*class_names):
+    """
+    指定クラスのいずれかを持つ要素（と子孫）だけを解析対象にするSoupStrainerを生成する
+    
+    解析中のclass属性は分割前の文字列のため、単語単位の正規表現で判定する。
+    """
+    pattern = '|'.join(re.escape(class_name) for class_name in class_names)
+    return SoupStrainer(attrs={'class': re.compile(rf'(?:^|\s)(?:{pattern})(?:\s|$)')})
+
+
 class Parser:
     """HTMLパーサークラス"""
     
+    # リトライで回復する可能性のあるエラー
+    RETRYABLE_ERRORS = (requests.exceptions.RequestException, AttributeError)
+    
+    # 解析バックエンド
+    BACKENDS = ('lxml', 'regex', 'bs4')
+    
+    # 店舗詳細ページで解析する領域（ヘッダー・予約欄の電話番号・店舗情報テーブル）
+    DETAIL_STRAINER = class_strainer(
+        'rstdtl-header',
+        'display-name',
+        'rstdtl-header__rst-name',
+        'rstdtl-side-yoyaku__tel-number',
+        'rstinfo-table',
+        'rstinfo-table__table',
+        'rstinfo-table__address',
+        'rstinfo-table__address-text',
+        'rstinfo-table__tel-num',
+        'rstinfo-opened-date',
+        'rstinfo-sns-instagram'
+    )
+    
+    # 店舗情報テーブルの見出しから取得する項目
+    # （出力項目名, 見出しに含まれる文字列, テキストノードごとに空白を除去して連結するか）
+    LABELED_FIELDS = (
+        ('ジャンル', 'ジャンル', True),
+        ('営業時間/定休日', '営業時間', False),
+        ('サービス', 'サービス', True)
+    )
+    
+    def __init__(self, http_client=None, backend=None, parse_pool=None, fields=None, filters=None):
+        """
+        Args:
+            http_client (HttpClient): 共有するHTTPクライアント（Noneの場合はparse_shop_detailsの初回に作成）
+            backend (str): 解析バックエンド（'lxml'、'regex' または 'bs4'）
+            parse_pool (ProcessPoolExecutor): 解析を行うプロセスプール（Noneの場合は呼び出したスレッドで解析）
+            fields (list): 抽出する項目（Noneの場合はSettings.SHOP_FIELDSの全項目）
+            filters (dict): 項目名→値の合否を返す関数（プロセスプールに渡すためpickle可能なもの）
+        """
+        self.http_client = http_client
+        self.backend = backend or Settings.PARSER_BACKEND
+        if self.backend not in self.BACKENDS:
+            raise ValueError(f"未対応の解析バックエンドです: {self.backend}")
+        self.parse_pool = parse_pool
+        self.filters = filters or {}
+        # 出力する項目に加え、フィルタの判定に使う項目も抽出する
+        fields = list(fields or Settings.SHOP_FIELDS)
+        self.fields = fields + [field for field in self.filters if field not in fields]
+        # 受信しながらの解析はlxmlの逐次パーサーでのみ行う（プロセスプールでの解析時は本文全体を渡す）
+        self.streaming = Settings.STREAM_DETAIL_PAGES and self.backend == 'lxml' and parse_pool is None
+        
     def parse_shop_details(self, shop_url):
-        """店舗詳細ページから情報を取得する"""
-        retry_count = 0
-        wait_time = Settings.RETRY_WAIT_TIME
+        """
+        店舗詳細ページから情報を取得する
         
-        while retry_count < Settings.MAX_RETRIES:
-            try:
-                response = requests.get(shop_url, timeout=Settings.REQUEST_TIMEOUT)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 店舗情報を抽出
-                shop_data = {
-                    '店舗名': self._extract_name(soup),
-                    'ジャンル': self._extract_genre(soup),
-                    '住所': self._extract_address(soup),
-                    'オープン日': self._extract_opened_date(soup),
-                    '電話番号': self._extract_phone(soup),
-                    'URL': shop_url,
-                    '営業時間/定休日': self._extract_opening_hours(soup),
-                    '公式アカウント': self._extract_instagram(soup),
-                    'サービス': self._extract_service(soup)
-                }
-                
-                return shop_data
-                
-            except requests.exceptions.RequestException as e:
-                print(f'{shop_url}でエラーが発生しました: {e}')
-                retry_count += 1
-                time.sleep(wait_time)
-                wait_time *= 2  # エクスポネンシャルバックオフ
-            except AttributeError as e:
-                print(f'{shop_url}で要素の取得に失敗しました: {e}')
-                retry_count += 1
-                time.sleep(wait_time)
-            except Exception as e:
-                print(f'{shop_url}で予期しないエラーが発生しました: {e}')
-                return self._get_empty_data(shop_url)
-                
-        return self._get_empty_data(shop_url)
+        Returns:
+            dict: 抽出する項目のみの店舗情報（フィルタで除外された場合はNone）
+        """
+        return self.finish(self.fetch_record(shop_url))
+        
+    def fetch_record(self, shop_url):
+        """
+        店舗詳細ページを取得・解析する
+        
+        通信エラーや要素の取得失敗（RETRYABLE_ERRORS）は例外として送出する。
+        リトライは呼び出し側でスケジュールする。
+        解析中の予期しないエラー（空の本文など）も例外として送出し、呼び出し側で取得失敗として記録する。
+        
+        Returns:
+            dict: URLを含む解析結果（フィルタで除外された場合も判定に使った項目を含む。finishで店舗情報にする）
+        """
+        # 共有セッションが渡されない場合は専用のセッションを作成（本文だけを解析する場合は作成しない）
+        if self.http_client is None:
+            self.http_client = HttpClient()
+            
+        extractor = None
+        if self.streaming:
+            # 必要な項目が揃った時点（フィルタで除外された時点）で残りの受信を打ち切る
+            extractor = StreamingExtractor(self.fields, self.filters)
+            response = self.http_client.stream(shop_url, extractor.feed)
+        else:
+            response = self.http_client.get(shop_url)
+        response.raise_for_status()
+        
+        # キャッシュ済み（304を含む）の解析結果で足りる場合は解析を省略
+        cached_record = getattr(response, 'cached_record', None)
+        if cached_record is not None and self.covers(cached_record):
+            return {'URL': shop_url, **cached_record}
+            
+        if self.parse_pool is not None:
+            # 解析用プロセスの結果を待つ間はGILを解放するため、他のスレッドの取得は止まらない
+            shop_data = self.parse_pool.submit(
+                parse_detail_page, response.content, response.encoding, shop_url,
+                self.backend, self.fields, self.filters
+            ).result()
+        elif extractor is None:
+            shop_data = self.parse_html(response.content, shop_url, encoding=response.encoding)
+        else:
+            # キャッシュから返された本文はまとめて解析する
+            if getattr(response, 'from_cache', False):
+                finished = extractor.feed(response.content, response.encoding)
+                # 別の項目・フィルタで打ち切った本文で項目が揃わない場合は取得し直す
+                if response.truncated and not finished:
+                    extractor = StreamingExtractor(self.fields, self.filters)
+                    response = self.http_client.stream(shop_url, extractor.feed, refresh=True)
+                    response.raise_for_status()
+            shop_data = extractor.extract(shop_url)
+            
+        # 一部の項目だけを抽出した場合も、以前の解析結果に追加して保存する
+        self.http_client.save_record(shop_url, {**(cached_record or {}), **shop_data})
+        return {'URL': shop_url, **shop_data}
+        
+    def parse_html(self, html, shop_url, fields=None, filters=None, encoding=None):
+        """
+        店舗詳細ページのHTMLから情報を抽出する
+        
+        フィルタの項目を先に抽出し、除外される場合はそれ以外の項目を抽出しない。
+        fields・filtersを省略した場合はこのParserの設定を使う。
+        本文はバイト列のまま渡せる（文字列へのデコードはバックエンドに任せる）。
+        
+        Args:
+            html (str | bytes): ページの本文
+            shop_url (str): 店舗詳細ページのURL
+            fields (list): 抽出する項目
+            filters (dict): 項目名→値の合否を返す関数
+            encoding (str): 本文がバイト列の場合の文字コード（Noneの場合はmeta要素の宣言、なければUTF-8）
+        """
+        fields = self.fields if fields is None else fields
+        filters = self.filters if filters is None else filters
+        if isinstance(html, bytes) and not encoding:
+            encoding = declared_encoding(None, html)
+        if self.backend == 'lxml':
+            return LxmlExtractor.extract(html, shop_url, fields, filters, encoding)
+        # 正規表現はUTF-8のバイト列に直接適用する（それ以外の文字コードのみ先にデコード）
+        if isinstance(html, bytes) and encoding != 'utf-8':
+            html = html.decode(encoding, errors='replace')
+        if self.backend == 'regex':
+            return RegexExtractor.extract(html, shop_url, fields, filters)
+        return self.parse_html_bs4(html, shop_url, fields, filters)
+        
+    def parse_html_bs4(self, html, shop_url, fields=None, filters=None):
+        """店舗詳細ページのHTML（文字列またはUTF-8のバイト列）から情報を抽出する（BeautifulSoup版、比較検証用）"""
+        # 口コミ・広告・スクリプト等は木を構築しない（JSON-LDは本文から直接取り出す）
+        from_encoding = 'utf-8' if isinstance(html, bytes) else None
+        soup = BeautifulSoup(html, 'html.parser', from_encoding=from_encoding, parse_only=self.DETAIL_STRAINER)
+        structured = _once(lambda: JsonLdExtractor.extract(JsonLdExtractor.find_scripts(html)))
+        labeled = _once(lambda: self._extract_labeled_fields(soup))
+        
+        # 店舗情報の抽出方法（構造化データにない項目のみDOMから取得）
+        getters = {
+            '店舗名': lambda: structured().get('店舗名') or self._extract_name(soup),
+            'ジャンル': lambda: structured().get('ジャンル') or labeled()['ジャンル'],
+            '住所': lambda: structured().get('住所') or self._extract_address(soup),
+            'オープン日': lambda: self._extract_opened_date(soup),
+            '電話番号': lambda: structured().get('電話番号') or self._extract_phone(soup),
+            'URL': lambda: shop_url,
+            '営業時間/定休日': lambda: labeled()['営業時間/定休日'],
+            '公式アカウント': lambda: self._extract_instagram(soup),
+            'サービス': lambda: labeled()['サービス']
+        }
+        
+        return extract_fields(getters, fields, filters)
         
     def _extract_name(self, soup):
         """店舗名を抽出"""
@@ -65,15 +203,6 @@ class Parser:
                          soup.find('p', class_='rstinfo-table__address-text')
         return address_element.text.strip() if address_element else Settings.NO_DATA_VALUE
         
-    def _extract_opening_hours(self, soup):
-        """営業時間を抽出"""
-        opening_hours_element = None
-        for heading in soup.find_all(['th', 'dt']):
-            if '営業時間' in heading.text:
-                opening_hours_element = heading.find_next(['td', 'dd'])
-                break
-        return opening_hours_element.text.strip() if opening_hours_element else Settings.NO_DATA_VALUE
-        
     def _extract_phone(self, soup):
         """電話番号を抽出"""
         phone_element = soup.find('p', class_='rstdtl-side-yoyaku__tel-number') or \
@@ -90,28 +219,638 @@ class Parser:
         instagram_element = soup.find('a', class_='rstinfo-sns-instagram')
         return instagram_element['href'] if instagram_element and 'href' in instagram_element.attrs else Settings.NO_DATA_VALUE
         
-    def _extract_service(self, soup):
-        """サービス情報を抽出"""
-        service = Settings.NO_DATA_VALUE
-        for th in soup.find_all('th'):
-            if 'サービス' in th.text:
-                next_td = th.find_next('td')
-                if next_td:
-                    service = next_td.get_text(strip=True)
-                break
-        return service
-        
-    def _extract_genre(self, soup):
-        """ジャンル情報を抽出"""
-        genre = Settings.NO_DATA_VALUE
-        for th in soup.find_all('th'):
-            if 'ジャンル' in th.text:
-                next_td = th.find_next('td')
-                if next_td:
-                    genre = next_td.get_text(strip=True)
+    def _extract_labeled_fields(self, soup):
+        """店舗情報テーブルを1回走査し、見出しから取得する項目をまとめて抽出"""
+        # 見出し→値の対応表（同じ見出しは最初のものを使用）
+        index = {}
+        headings = [
+            heading
+            for table in soup.find_all('table', class_='rstinfo-table__table')
+            for heading in table.find_all(['th', 'dt'])
+        ] or soup.find_all(['th', 'dt'])
+        for heading in headings:
+            label = heading.get_text(strip=True)
+            if label not in index:
+                index[label] = heading.find_next(['td', 'dd'])
+                
+        fields = {}
+        for field, keyword, strip_each in self.LABELED_FIELDS:
+            value = _find_labeled_value(index, keyword)
+            if value is None:
+                fields[field] = Settings.NO_DATA_VALUE
+            else:
+                fields[field] = value.get_text(strip=True) if strip_each else value.text.strip()
+        return fields
+        
+    def covers(self, record):
+        """以前の解析結果（キャッシュ・店舗データベース）だけで判定・出力ができるか"""
+        if not all(field in record for field in self.filters):
+            return False
+        return not accepts(record, self.filters) or all(field in record for field in self.fields)
+        
+    def finish(self, shop_data):
+        """フィルタで除外された場合はNone、それ以外は抽出する項目のみを返す"""
+        if not accepts(shop_data, self.filters):
+            return None
+        return {field: shop_data[field] for field in self.fields}
+
+
+# 解析用プロセスごとに使い回すパーサー（バックエンド別）
+_process_parsers = {}
+
+
+def parse_detail_page(content, encoding, shop_url, backend=None, fields=None, filters=None):
+    """
+    店舗詳細ページの本文から情報を抽出する（解析用プロセスで実行）
+    
+    ProcessPoolExecutorに渡すため、引数と戻り値はpickle可能な値のみとする。
+    
+    Args:
+        content (bytes): ページの本文（デコードせずに解析バックエンドに渡す）
+        encoding (str): 本文の文字コード
+        shop_url (str): 店舗詳細ページのURL
+        backend (str): 解析バックエンド
+        fields (list): 抽出する項目
+        filters (dict): 項目名→値の合否を返す関数
+        
+    Returns:
+        dict: 店舗情報
+    """
+    backend = backend or Settings.PARSER_BACKEND
+    parser = _process_parsers.get(backend)
+    if parser is None:
+        parser = _process_parsers[backend] = Parser(backend=backend)
+    return parser.parse_html(content, shop_url, fields or Settings.SHOP_FIELDS, filters or {}, encoding)
+
+
+def extract_fields(getters, fields=None, filters=None):
+    """
+    項目ごとの抽出関数から店舗情報を作成する
+    
+    フィルタの判定に使う項目を先に抽出し、除外が決まった時点でそれまでの項目だけを返す。
+    除外されなかった場合は指定された項目のみを抽出する。
+    
+    Args:
+        getters (dict): 項目名→抽出関数
+        fields (list): 抽出する項目（Noneの場合はSettings.SHOP_FIELDS）
+        filters (dict): 項目名→値の合否を返す関数
+        
+    Returns:
+        dict: 店舗情報
+    """
+    fields = Settings.SHOP_FIELDS if fields is None else fields
+    shop_data = {}
+    for field, accept in (filters or {}).items():
+        shop_data[field] = getters[field]()
+        if not accept(shop_data[field]):
+            return shop_data
+            
+    for field in fields:
+        if field not in shop_data:
+            shop_data[field] = getters[field]()
+            
+    # 抽出する項目の順に並べる（フィルタの判定のみに使う項目は末尾）
+    return {field: shop_data[field] for field in dict.fromkeys([*fields, *shop_data])}
+
+
+def accepts(shop_data, filters):
+    """店舗情報がフィルタを全て満たすか判定（判定に使う項目がない場合は満たさない）"""
+    return all(field in shop_data and accept(shop_data[field]) for field, accept in filters.items())
+
+
+def _once(func):
+    """最初に呼び出した時の結果を使い回す関数を返す（複数の項目で共有する解析用）"""
+    results = []
+    
+    def wrapper():
+        if not results:
+            results.append(func())
+        return results[0]
+    return wrapper
+
+
+def _find_labeled_value(index, keyword):
+    """見出しに指定の文字列を含む最初の値要素を返す"""
+    for label, value in index.items():
+        if keyword in label:
+            return value
+    return None
+
+
+# 文字列の正規表現→バイト列用の正規表現
+_bytes_patterns = {}
+
+
+def _for_document(pattern, document):
+    """本文の型に合わせた正規表現を返す（バイト列の本文にはUTF-8に変換したパターンを使う）"""
+    if isinstance(document, str):
+        return pattern
+    compiled = _bytes_patterns.get(pattern)
+    if compiled is None:
+        compiled = _bytes_patterns[pattern] = re.compile(
+            pattern.pattern.encode('utf-8'), pattern.flags & ~re.UNICODE
+        )
+    return compiled
+
+
+def _decode(fragment):
+    """バイト列（UTF-8）の一致部分を文字列に変換"""
+    return fragment.decode('utf-8', errors='replace') if isinstance(fragment, bytes) else fragment
+
+
+def _has_class(class_name):
+    """class属性に指定クラスを含むかを判定するXPath条件"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+class LxmlExtractor:
+    """lxmlによる店舗情報抽出クラス
+    
+    XPathはモジュール読み込み時にコンパイルし、ページごとの解析では再利用する。
+    抽出結果はParser.parse_html_bs4と同じ形式の辞書になる。
+    """
+    
+    # 候補が複数ある項目は先に書いたXPathを優先する
+    NAME = (
+        etree.XPath(f"//h2[{_has_class('display-name')}]"),
+        etree.XPath(f"//h2[{_has_class('rstdtl-header__rst-name')}]")
+    )
+    ADDRESS = (
+        etree.XPath(f"//p[{_has_class('rstinfo-table__address')}]"),
+        etree.XPath(f"//p[{_has_class('rstinfo-table__address-text')}]")
+    )
+    PHONE = (
+        etree.XPath(f"//p[{_has_class('rstdtl-side-yoyaku__tel-number')}]"),
+        etree.XPath(f"//strong[{_has_class('rstinfo-table__tel-num')}]")
+    )
+    OPENED_DATE = (etree.XPath(f"//p[{_has_class('rstinfo-opened-date')}]"),)
+    INSTAGRAM = (etree.XPath(f"//a[{_has_class('rstinfo-sns-instagram')}]"),)
+    
+    # 店舗情報テーブルの見出し（th/dt）と、文書順で次の値（td/dd）
+    RSTINFO_HEADINGS = etree.XPath(
+        f"//table[{_has_class('rstinfo-table__table')}]//*[self::th or self::dt]"
+    )
+    ALL_HEADINGS = etree.XPath('//th | //dt')
+    HEADING_VALUE = etree.XPath('following::*[self::td or self::dd][1]')
+    
+    JSON_LD = etree.XPath("//script[@type='application/ld+json']/text()")
+    TEXT_NODES = etree.XPath('.//text()')
+    
+    # スレッドごとの文字コード→パーサー（パーサーはスレッド間で共有しない）
+    _local = threading.local()
+    
+    @classmethod
+    def extract(cls, html, shop_url, fields=None, filters=None, encoding=None):
+        """店舗詳細ページのHTMLから情報を抽出する"""
+        return cls.extract_tree(cls.parse(html, encoding), shop_url, fields, filters)
+        
+    @classmethod
+    def parse(cls, html, encoding=None):
+        """
+        HTMLを解析して木のルート要素を返す
+        
+        バイト列は指定の文字コードでlxmlが直接デコードする（Pythonの文字列を経由しない）。
+        
+        Args:
+            html (str | bytes): ページの本文
+            encoding (str): 本文がバイト列の場合の文字コード（Noneの場合はlxmlが判定）
+        """
+        if isinstance(html, str) or not encoding:
+            return lxml_html.fromstring(html)
+        parsers = cls._local.__dict__.setdefault('parsers', {})
+        parser = parsers.get(encoding)
+        if parser is None:
+            parser = parsers[encoding] = lxml_html.HTMLParser(encoding=encoding)
+        return lxml_html.fromstring(html, parser=parser)
+        
+    @classmethod
+    def extract_tree(cls, root, shop_url, fields=None, filters=None):
+        """
+        解析済みの木（lxml.htmlの要素）から情報を抽出する
+        
+        Args:
+            root: 木のルート要素
+            shop_url (str): 店舗詳細ページのURL
+            fields (list): 抽出する項目（Noneの場合は全項目）
+            filters (dict): 項目名→値の合否を返す関数（先に判定し、除外される場合は以降を抽出しない）
+        """
+        return extract_fields(cls.getters(root, shop_url), fields, filters)
+        
+    @classmethod
+    def getters(cls, root, shop_url):
+        """項目名→抽出関数の辞書を返す（複数の項目で共有する解析は最初に必要になった時点で行う）"""
+        structured = _once(lambda: JsonLdExtractor.extract(cls.JSON_LD(root)))
+        labeled = _once(lambda: cls._extract_labeled_fields(root))
+        
+        # 店舗情報の抽出方法（構造化データにない項目のみDOMから取得）
+        return {
+            '店舗名': lambda: structured().get('店舗名') or cls._text(cls._first(cls.NAME, root)),
+            'ジャンル': lambda: structured().get('ジャンル') or labeled()['ジャンル'],
+            '住所': lambda: structured().get('住所') or cls._text(cls._first(cls.ADDRESS, root)),
+            'オープン日': lambda: cls._text(cls._first(cls.OPENED_DATE, root)),
+            '電話番号': lambda: structured().get('電話番号') or cls._text(cls._first(cls.PHONE, root)),
+            'URL': lambda: shop_url,
+            '営業時間/定休日': lambda: labeled()['営業時間/定休日'],
+            '公式アカウント': lambda: cls._href(cls._first(cls.INSTAGRAM, root)),
+            'サービス': lambda: labeled()['サービス']
+        }
+        
+    @classmethod
+    def _extract_labeled_fields(cls, root):
+        """店舗情報テーブルを1回走査し、見出しから取得する項目をまとめて抽出"""
+        # 見出し→値の対応表（同じ見出しは最初のものを使用）
+        index = {}
+        for heading in cls.RSTINFO_HEADINGS(root) or cls.ALL_HEADINGS(root):
+            label = cls._stripped_text(heading)
+            if label not in index:
+                values = cls.HEADING_VALUE(heading)
+                index[label] = values[0] if values else None
+                
+        fields = {}
+        for field, keyword, strip_each in Parser.LABELED_FIELDS:
+            value = _find_labeled_value(index, keyword)
+            fields[field] = cls._stripped_text(value) if strip_each else cls._text(value)
+        return fields
+        
+    @staticmethod
+    def _first(xpaths, root):
+        """候補のXPathを順に評価し、最初に見つかった要素を返す"""
+        for xpath in xpaths:
+            elements = xpath(root)
+            if elements:
+                return elements[0]
+        return None
+        
+    @staticmethod
+    def _text(element):
+        """要素のテキスト（前後の空白を除去）"""
+        return element.text_content().strip() if element is not None else Settings.NO_DATA_VALUE
+        
+    @classmethod
+    def _stripped_text(cls, element):
+        """各テキストノードの空白を除去して連結（get_text(strip=True)相当）"""
+        if element is None:
+            return Settings.NO_DATA_VALUE
+        return ''.join(text.strip() for text in cls.TEXT_NODES(element))
+        
+    @staticmethod
+    def _href(element):
+        """リンク先URL"""
+        if element is None or element.get('href') is None:
+            return Settings.NO_DATA_VALUE
+        return element.get('href')
+
+
+class StreamingExtractor:
+    """店舗詳細ページを受信しながら解析するクラス
+    
+    受信したチャンクをlxmlの逐次パーサーに渡し、出力項目が全て見つかった時点か
+    店舗情報テーブルの終わりまで解析した時点で、受信を打ち切ってよいことを知らせる。
+    抽出は受信済みの部分木に対してLxmlExtractorで行う。
+    """
+    
+    # 見つかった時点で項目が揃ったとみなす要素のクラス（候補が複数ある項目は優先される要素のみ）
+    FIELD_CLASSES = {
+        'display-name': '店舗名',
+        'rstinfo-table__address': '住所',
+        'rstdtl-side-yoyaku__tel-number': '電話番号',
+        'rstinfo-opened-date': 'オープン日',
+        'rstinfo-sns-instagram': '公式アカウント'
+    }
+    
+    # 閉じた時点で以降に出力項目がないとみなす要素のクラス（店舗情報テーブル全体）
+    SECTION_END_CLASS = 'rstinfo-table'
+    
+    # 判定に使う要素（それ以外の要素の終了イベントは受け取らない）
+    WATCHED_TAGS = ('script', 'h2', 'p', 'a', 'strong', 'th', 'td', 'dt', 'dd', 'div')
+    
+    def __init__(self, fields=None, filters=None):
+        """
+        Args:
+            fields (list): 抽出する項目（全て見つかった時点で受信を打ち切る）
+            filters (dict): 項目名→値の合否を返す関数（除外が決まった時点で受信を打ち切る）
+        """
+        self.fields = list(fields or Settings.SHOP_FIELDS)
+        self.filters = filters or {}
+        self.parser = None
+        self.found = {'URL'}
+        self.heading = None
+        self.filtered = False
+        self.finished = False
+        
+    def feed(self, chunk, encoding=None):
+        """
+        受信したチャンクを解析する
+        
+        Args:
+            chunk (bytes): 受信した本文の一部
+            encoding (str): 本文の文字コード（最初のチャンクでのみ使用）
+            
+        Returns:
+            bool: 必要な項目が揃い、受信を打ち切ってよい場合はTrue
+        """
+        if self.parser is None:
+            self.parser = etree.HTMLPullParser(events=('end',), tag=self.WATCHED_TAGS, encoding=encoding)
+            self.parser.set_element_class_lookup(lxml_html.HtmlElementClassLookup())
+            
+        self.parser.feed(chunk)
+        for _, element in self.parser.read_events():
+            self._check(element)
+            if self.finished:
                 break
-        return genre
+        return self.finished
+        
+    def extract(self, shop_url):
+        """受信済みの部分から情報を抽出する"""
+        if self.parser is None:
+            raise ValueError('本文が空です')
+        return LxmlExtractor.extract_tree(self.parser.close(), shop_url, self.fields, self.filters)
+        
+    def _check(self, element):
+        """閉じた要素から見つかった項目を記録する"""
+        tag = element.tag
+        if tag == 'script':
+            if element.get('type') == JsonLdExtractor.SCRIPT_TYPE:
+                self.found.update(JsonLdExtractor.extract([element.text]))
+        elif tag in ('th', 'dt'):
+            self.heading = LxmlExtractor._stripped_text(element)
+        elif tag in ('td', 'dd'):
+            # 直前の見出しの値が閉じたら、見出しから取得する項目が揃う
+            if self.heading:
+                for field, keyword, _ in Parser.LABELED_FIELDS:
+                    if keyword in self.heading:
+                        self.found.add(field)
+                self.heading = None
+        else:
+            class_names = element.get('class', '').split()
+            if tag == 'div' and self.SECTION_END_CLASS in class_names:
+                self.finished = True
+                return
+            for class_name in class_names:
+                field = self.FIELD_CLASSES.get(class_name)
+                if field:
+                    self.found.add(field)
+                    
+        # フィルタの項目が揃ったら、受信済みの部分で除外されるか判定する
+        if self.filters and not self.filtered and self.found.issuperset(self.filters):
+            self.filtered = True
+            root = element.getroottree().getroot()
+            if not accepts(LxmlExtractor.extract_tree(root, '', [], self.filters), self.filters):
+                self.finished = True
+                return
+                
+        if self.found.issuperset(self.fields):
+            self.finished = True
+
+
+class JsonLdExtractor:
+    """構造化データ（JSON-LD）による店舗情報抽出クラス
+    
+    店舗名・住所・電話番号・ジャンルを取得する。
+    取得できなかった項目は結果に含めず、呼び出し側でDOMから取得する。
+    """
+    
+    SCRIPT_TYPE = 'application/ld+json'
+    SCRIPT_PATTERN = re.compile(
+        r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+        re.IGNORECASE | re.DOTALL
+    )
+    
+    @classmethod
+    def find_scripts(cls, html):
+        """HTML（文字列またはUTF-8のバイト列）からJSON-LDのscript要素の内容を取り出す"""
+        return _for_document(cls.SCRIPT_PATTERN, html).findall(html)
+        
+    @classmethod
+    def extract(cls, scripts):
+        """
+        JSON-LDのscript要素の内容から店舗情報を抽出する
+        
+        Args:
+            scripts (iterable): script要素の内容（文字列）
+            
+        Returns:
+            dict: 取得できた項目のみを含む店舗情報
+        """
+        shop = cls._find_shop(scripts)
+        if shop is None:
+            return {}
+            
+        fields = {
+            '店舗名': cls._string(shop.get('name')),
+            'ジャンル': cls._string(shop.get('servesCuisine')),
+            '住所': cls._address(shop.get('address')),
+            '電話番号': cls._string(shop.get('telephone'))
+        }
+        return {field: value for field, value in fields.items() if value}
+        
+    @staticmethod
+    def _find_shop(scripts):
+        """住所を持つ最初のオブジェクト（店舗）を探す（パンくずリスト等は除外される）"""
+        for script in scripts:
+            if not script:
+                continue
+            try:
+                data = json.loads(script)
+            except ValueError:
+                continue
+            if isinstance(data, dict):
+                data = data.get('@graph', [data])
+            if not isinstance(data, list):
+                continue
+            for candidate in data:
+                if isinstance(candidate, dict) and candidate.get('address'):
+                    return candidate
+        return None
+        
+    @staticmethod
+    def _string(value):
+        """文字列またはその配列を文字列に変換"""
+        if isinstance(value, list):
+            value = '、'.join(str(item).strip() for item in value if item)
+        return value.strip() if isinstance(value, str) else ''
+        
+    @classmethod
+    def _address(cls, address):
+        """PostalAddressを「都道府県+市区町村+番地」の文字列に変換"""
+        if not isinstance(address, dict):
+            return cls._string(address)
+        region = cls._string(address.get('addressRegion'))
+        locality = cls._string(address.get('addressLocality'))
+        street = cls._string(address.get('streetAddress'))
+        # 番地に都道府県から含まれている場合はそのまま使う
+        if region and street.startswith(region):
+            return street
+        return region + locality + street
+
+
+def _class_pattern(tag, class_name):
+    """指定クラスを持つ開始タグの正規表現（class属性の値を単語単位で判定）"""
+    return rf'<{tag}\s[^>]*?class="(?:[^"]*\s)?{re.escape(class_name)}(?:\s[^"]*)?"[^>]*>'
+
+
+class RegexExtractor:
+    """正規表現による店舗情報の高速抽出クラス
+    
+    DOMを構築せずに本文から直接各項目を取り出す。見つからない項目や値が妥当でない項目だけ
+    LxmlExtractorで抽出し（DOMは最初に必要になった時点で構築）、項目ごとの結果を集計する。
+    ヒット率の低下は食べログのマークアップ変更の兆候になる。
+    """
+    
+    # 候補が複数ある項目は先に書いたパターンを優先する（LxmlExtractorと同じ順序）
+    NAME = (
+        re.compile(_class_pattern('h2', 'display-name') + r'(.*?)</h2>', re.DOTALL),
+        re.compile(_class_pattern('h2', 'rstdtl-header__rst-name') + r'(.*?)</h2>', re.DOTALL)
+    )
+    ADDRESS = (
+        re.compile(_class_pattern('p', 'rstinfo-table__address') + r'(.*?)</p>', re.DOTALL),
+        re.compile(_class_pattern('p', 'rstinfo-table__address-text') + r'(.*?)</p>', re.DOTALL)
+    )
+    PHONE = (
+        re.compile(_class_pattern('p', 'rstdtl-side-yoyaku__tel-number') + r'(.*?)</p>', re.DOTALL),
+        re.compile(_class_pattern('strong', 'rstinfo-table__tel-num') + r'(.*?)</strong>', re.DOTALL)
+    )
+    OPENED_DATE = (re.compile(_class_pattern('p', 'rstinfo-opened-date') + r'(.*?)</p>', re.DOTALL),)
+    INSTAGRAM = re.compile(_class_pattern('a', 'rstinfo-sns-instagram'))
+    HREF = re.compile(r'\shref="([^"]*)"')
+    
+    # 見出しと直後の値（見出しの文字列はParser.LABELED_FIELDSのもの）
+    LABELED = {
+        keyword: re.compile(
+            rf'<(th|dt)(?:\s[^>]*)?>((?:(?!</\1>).)*?{re.escape(keyword)}(?:(?!</\1>).)*?)</\1>'
+            r'\s*<(td|dd)(?:\s[^>]*)?>(.*?)</\3>',
+            re.DOTALL
+        )
+        for _, keyword, _ in Parser.LABELED_FIELDS
+    }
+    
+    TAG = re.compile(r'<[^>]*>')
+    
+    # 抽出した値として妥当な最大文字数（超える場合は別の領域まで取り込んだとみなす）
+    MAX_VALUE_LENGTH = 500
+    
+    # 項目名→[正規表現で取得, DOMで補完, どちらでも取得できず] の件数
+    stats = {}
+    stats_lock = threading.Lock()
+    
+    @classmethod
+    def extract(cls, html, shop_url, fields=None, filters=None):
+        """店舗詳細ページのHTML（文字列またはUTF-8のバイト列）から情報を抽出する"""
+        structured = _once(lambda: JsonLdExtractor.extract(JsonLdExtractor.find_scripts(html)))
+        encoding = 'utf-8' if isinstance(html, bytes) else None
+        dom = _once(lambda: LxmlExtractor.getters(LxmlExtractor.parse(html, encoding), shop_url))
+        counts = {}
+        
+        def fast(field, extract_value):
+            """正規表現で抽出し、取得できなければDOMで補完する関数を返す"""
+            def getter():
+                value = extract_value()
+                if value is not None:
+                    outcome = 0
+                else:
+                    value = dom()[field]()
+                    outcome = 2 if value == Settings.NO_DATA_VALUE else 1
+                counts[field] = outcome
+                return value
+            return getter
+            
+        # 見出しから取得する項目→（見出しの文字列, テキストノードごとに空白を除去するか）
+        labeled = {field: (keyword, strip_each) for field, keyword, strip_each in Parser.LABELED_FIELDS}
+        
+        # 店舗情報の抽出方法（構造化データにない項目のみ正規表現で取得）
+        getters = {
+            '店舗名': fast('店舗名', lambda: structured().get('店舗名') or cls._match_text(cls.NAME, html)),
+            'ジャンル': fast('ジャンル', lambda: structured().get('ジャンル') or cls._match_labeled(*labeled['ジャンル'], html)),
+            '住所': fast('住所', lambda: structured().get('住所') or cls._match_text(cls.ADDRESS, html)),
+            'オープン日': fast('オープン日', lambda: cls._match_text(cls.OPENED_DATE, html)),
+            '電話番号': fast('電話番号', lambda: structured().get('電話番号') or cls._match_text(cls.PHONE, html)),
+            'URL': lambda: shop_url,
+            '営業時間/定休日': fast('営業時間/定休日', lambda: cls._match_labeled(*labeled['営業時間/定休日'], html)),
+            '公式アカウント': fast('公式アカウント', lambda: cls._match_href(html)),
+            'サービス': fast('サービス', lambda: cls._match_labeled(*labeled['サービス'], html))
+        }
+        
+        shop_data = extract_fields(getters, fields, filters)
+        cls._record(counts)
+        return shop_data
+        
+    @classmethod
+    def hit_rates(cls):
+        """
+        項目ごとの集計結果を返す
+        
+        プロセスプールで解析した分は各プロセス内で集計されるため含まれない。
+        
+        Returns:
+            dict: 項目名→(ヒット率（値があったページのうち正規表現で取得できた割合、該当なしはNone）,
+                  正規表現で取得, DOMで補完, どちらでも取得できず)
+        """
+        with cls.stats_lock:
+            return {
+                field: ((hits / (hits + fallbacks)) if hits + fallbacks else None, hits, fallbacks, absent)
+                for field, (hits, fallbacks, absent) in cls.stats.items()
+            }
+            
+    @classmethod
+    def reset_stats(cls):
+        """集計結果をクリア"""
+        with cls.stats_lock:
+            cls.stats = {}
+            
+    @classmethod
+    def _record(cls, counts):
+        """1ページ分の結果を集計に加える"""
+        with cls.stats_lock:
+            for field, outcome in counts.items():
+                cls.stats.setdefault(field, [0, 0, 0])[outcome] += 1
+                
+    @classmethod
+    def _match_text(cls, patterns, html):
+        """候補のパターンを順に試し、最初に見つかった要素のテキストを返す"""
+        for pattern in patterns:
+            match = _for_document(pattern, html).search(html)
+            if match:
+                fragment = _decode(match.group(1))
+                return cls._valid(fragment, cls._text(fragment))
+        return None
+        
+    @classmethod
+    def _match_href(cls, html):
+        """Instagramのリンク先URLを返す"""
+        match = _for_document(cls.INSTAGRAM, html).search(html)
+        if not match:
+            return None
+        href = cls.HREF.search(_decode(match.group()))
+        if not href:
+            return None
+        url = unescape(href.group(1))
+        return url if url.startswith(('http://', 'https://')) else None
+        
+    @classmethod
+    def _match_labeled(cls, keyword, strip_each, html):
+        """見出しに指定の文字列を含む最初の値のテキストを返す"""
+        match = _for_document(cls.LABELED[keyword], html).search(html)
+        if not match:
+            return None
+        fragment = _decode(match.group(4))
+        value = cls._stripped_text(fragment) if strip_each else cls._text(fragment)
+        return cls._valid(fragment, value)
+        
+    @classmethod
+    def _valid(cls, fragment, value):
+        """抽出した値が妥当な場合のみ返す（入れ子の表や閉じタグの取り違えはDOMで抽出し直す）"""
+        if not value or len(value) > cls.MAX_VALUE_LENGTH:
+            return None
+        if '<table' in fragment or '<td' in fragment or '<' in value:
+            return None
+        return value
+        
+    @classmethod
+    def _text(cls, fragment):
+        """タグを除いたテキスト（前後の空白を除去、text_content().strip()相当）"""
+        return unescape(cls.TAG.sub('', fragment)).strip()
         
-    def _get_empty_data(self, shop_url):
-        """空のデータを返す"""
-        return {field: Settings.NO_DATA_VALUE for field in Settings.SHOP_FIELDS} | {'URL': shop_url}
\ No newline at end of file
+    @classmethod
+    def _stripped_text(cls, fragment):
+        """各テキストノードの空白を除去して連結（get_text(strip=True)相当）"""
+        return ''.join(unescape(text).strip() for text in cls.TAG.split(fragment))
\ No newline at end of file
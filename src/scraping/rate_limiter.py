@@ -0,0 +1,67 @@
+"""
+リクエストレート制限機能
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """トークンバケット方式のレート制限クラス
+    
+    全てのリクエスト（一覧・詳細・リトライ）が同じバケットからトークンを取得する。
+    複数のワーカースレッドから共有して使用できる。
+    """
+    
+    def __init__(self, rate, burst=1):
+        """
+        Args:
+            rate (float): 1秒あたりに補充されるトークン数（リクエスト/秒）
+            burst (int): バケットの容量（連続して送信できるリクエスト数）
+        """
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+        
+    def reserve(self):
+        """
+        トークンを1つ予約する
+        
+        Returns:
+            float: トークンが使用可能になるまでの待機秒数（0の場合は即時）
+        """
+        with self.lock:
+            self._refill()
+            self.tokens -= 1
+            # Retry-Afterによる一時停止中はその終了まで待つ
+            pause_time = max(0.0, self.paused_until - self.updated_at)
+            if self.tokens >= 0:
+                return pause_time
+            # 不足分は補充レートに従って後続の予約ほど長く待つ
+            return pause_time - self.tokens / self.rate
+            
+    def acquire(self):
+        """トークンが使用可能になるまで待機する"""
+        wait_time = self.reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+            
+    def set_rate(self, rate):
+        """補充レートを変更する"""
+        with self.lock:
+            self._refill()
+            self.rate = rate
+            
+    def pause(self, seconds):
+        """指定秒数の間、トークンの払い出しを停止する"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            
+    def _refill(self):
+        """経過時間に応じてトークンを補充"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+リトライスケジューリング機能
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+
+from config import Settings
+
+
+class RetryScheduler:
+    """失敗した取得を遅延キューに積み、待機時間経過後に再投入するクラス
+    
+    待機はスケジューラー専用のスレッドで行うため、
+    ワーカースレッドはリトライ待ちの間も他の取得を続けられる。
+    """
+    
+    def __init__(self, max_retries=None, base_wait=None, max_wait=None):
+        """
+        Args:
+            max_retries (int): 最大試行回数
+            base_wait (float): 初回リトライの待機時間（秒）
+            max_wait (float): 待機時間の上限（秒）
+        """
+        self.max_retries = max_retries or Settings.MAX_RETRIES
+        self.base_wait = base_wait or Settings.RETRY_WAIT_TIME
+        self.max_wait = max_wait or Settings.RETRY_MAX_WAIT_TIME
+        
+        self.failures = []
+        self.heap = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.stopped = False
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+        
+    def backoff(self, attempt):
+        """試行回数に応じたジッター付きの待機時間を返す"""
+        wait_time = min(self.max_wait, self.base_wait * (2 ** (attempt - 1)))
+        return wait_time * random.uniform(1 - Settings.RETRY_JITTER, 1 + Settings.RETRY_JITTER)
+        
+    def schedule(self, retry, attempt, url, error):
+        """
+        失敗したタスクをリトライ待ちに登録する
+        
+        Args:
+            retry (callable): 待機時間の経過後に呼び出す再投入処理
+            attempt (int): これまでの試行回数
+            url (str): 取得対象のURL
+            error (Exception): 発生したエラー
+            
+        Returns:
+            bool: 登録した場合はTrue、試行回数の上限に達した場合はFalse
+        """
+        if attempt >= self.max_retries:
+            self.add_failure(url, error)
+            return False
+            
+        due_at = time.monotonic() + self.backoff(attempt)
+        with self.condition:
+            heapq.heappush(self.heap, (due_at, next(self.counter), retry))
+            self.condition.notify()
+        return True
+        
+    def add_failure(self, url, error):
+        """リトライ上限に達したURLを記録"""
+        with self.condition:
+            self.failures.append((url, str(error)))
+            
+    def stop(self):
+        """スケジューラーを停止"""
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+        self.thread.join()
+        
+    def _run(self):
+        """待機時間が経過したタスクを順に再投入する"""
+        while True:
+            with self.condition:
+                while not self.stopped and (not self.heap or self.heap[0][0] > time.monotonic()):
+                    timeout = self.heap[0][0] - time.monotonic() if self.heap else None
+                    self.condition.wait(timeout)
+                if self.stopped:
+                    return
+                _, _, retry = heapq.heappop(self.heap)
+            retry()
\ No newline at end of file
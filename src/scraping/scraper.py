@@ -2,33 +2,74 @@
 スクレイピングコア機能
 """
 
+import math
+import queue
+import re
 import threading
 import time
+from collections import deque, namedtuple
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
 import requests
 from bs4 import BeautifulSoup
 
 from .url_builder import URLBuilder
-from .parser import Parser
-from utils import DateFilter, FileHandler
+from .parser import Parser, RegexExtractor, class_strainer
+from .http_client import HttpClient, declared_encoding
+from .rate_limiter import RateLimiter
+from .throttle import AdaptiveThrottle
+from .retry_scheduler import RetryScheduler
+from .page_cache import PageCache
+from utils import DateFilter, FileHandler, ShopStore, Checkpoint
 from data import prefectures_values, prefectures_middle_category, prefectures_small_category
 from config import Settings
 
 
+# 一覧ページのカード1件分（opened_date: ニューオープンモードで表示されるオープン日、ない場合はNone）
+ShopCard = namedtuple('ShopCard', ['url', 'name', 'area_genre', 'opened_date'])
+
+
 class Scraper:
     """スクレイパークラス"""
     
+    # 一覧ページで解析する領域（店舗リスト・検索結果件数・次ページへのリンク）
+    LIST_STRAINER = class_strainer('list-rst', 'c-page-count__num', 'c-pagination__arrow--next')
+    
+    # カードに表示されるオープン日（例: 2024年5月1日オープン）
+    CARD_OPENED_DATE_PATTERN = re.compile(r'\d{4}年\d{1,2}月(?:\d{1,2}日)?\s*オープン')
+    
     def __init__(self):
         self.stop_flag = False
+        self.pipeline_done = threading.Event()
         self.thread = None
+        self.http_client = None
+        self.parser = None
+        self.parse_pool = None
+        self.retry_scheduler = None
+        self.page_cache = None
+        self.output_writer = None
+        self.shop_store = None
+        self.reused_count = 0
+        self.checkpoint = None
+        self.search_params = None
+        self.resumed_records = {}
+        self.progress_callback = None
+        self.status_callback = None
+        self.log_callback = None
+        self.complete_callback = None
+        self.concurrency_callback = None
         
     def start(self, search_params, progress_callback=None, status_callback=None, 
-              log_callback=None, complete_callback=None):
+              log_callback=None, complete_callback=None, concurrency_callback=None):
         """スクレイピングを開始"""
         self.stop_flag = False
         self.progress_callback = progress_callback
         self.status_callback = status_callback
         self.log_callback = log_callback
         self.complete_callback = complete_callback
+        self.concurrency_callback = concurrency_callback
         
         # 別スレッドで実行
         self.thread = threading.Thread(target=self._scrape, args=(search_params,))
@@ -45,69 +86,72 @@ class Scraper:
             self._update_status("スクレイピングの準備中...")
             self._add_log("スクレイピングを開始します")
             
+            # 中断したクロールを再開する場合は、同じ検索条件のチェックポイントを探す
+            resume = self._load_resume(search_params)
+            self.search_params = search_params
+            self.resumed_records = {}
+            
             # パラメータの解析
             params = self._parse_params(search_params)
-            
-            # URL生成
-            current_url = URLBuilder.build(
-                prefecture_code=params['prefecture_code'],
-                middle_code=params['middle_code'],
-                small_code=params['small_code'],
-                start_page=params['start_page'],
-                new_open_mode=params['new_open_mode']
+            if resume:
+                self._resume_params(params, resume)
+                
+            # 一覧ページと詳細ページで共有するHTTPセッションとレート制限
+            rate_limiter = RateLimiter(Settings.REQUESTS_PER_SECOND, Settings.RATE_LIMIT_BURST)
+            self.http_client = HttpClient(
+                pool_size=max(Settings.HTTP_POOL_SIZE, params['max_workers'] + 1),
+                rate_limiter=rate_limiter,
+                throttle=self._create_throttle(rate_limiter, params),
+                cache=PageCache() if Settings.CACHE_ENABLED else None
             )
+            self.parse_pool = self._create_parse_pool()
+            RegexExtractor.reset_stats()
+            self.parser = Parser(
+                self.http_client,
+                parse_pool=self.parse_pool,
+                fields=params['output_fields'],
+                filters=self._build_filters(params)
+            )
+            self.retry_scheduler = RetryScheduler()
+            self._open_output(search_params, params, resume)
+            self.checkpoint = self._create_checkpoint()
+            self.shop_store = self._create_shop_store(search_params)
+            self.reused_count = 0
             
-            self._update_status(f"スクレイピング開始: {current_url}")
-            self._add_log(f"URL: {current_url}")
-            
-            # スクレイピング実行
-            all_scraped_data = []
-            page_count = params['start_page']
-            pages_scraped = 0
-            
-            while current_url and page_count <= params['end_page'] and not self.stop_flag:
-                self._update_status(f"スクレイピング中: ページ {page_count}/{params['end_page']}")
-                self._update_progress(pages_scraped + 1, params['max_pages'])
-                self._add_log(f"ページ {page_count} をスクレイピング中: {current_url}")
+            # スクレイピング実行（前回のクロールで全ページを確定済みの場合は保存のみ行う）
+            if params['max_pages'] > 0:
+                self._crawl(params)
                 
-                # ページのスクレイピング
-                page_data, next_url = self._scrape_page(current_url, params)
-                
-                if page_data:
-                    all_scraped_data.extend(page_data)
-                    pages_scraped += 1
-                    
-                    # 最大ページ数に達したかチェック
-                    if pages_scraped >= params['max_pages']:
-                        self._add_log(f"最大ページ数({params['max_pages']}ページ)に達しました。")
-                        break
-                        
-                    # 次のページへ
-                    if next_url:
-                        current_url = next_url
-                        page_count += 1
-                        time.sleep(Settings.PAGE_WAIT_TIME)
-                    else:
-                        self._add_log("次のページはありません。")
-                        break
-                else:
-                    break
-                    
-            # 結果の保存
-            if all_scraped_data and not self.stop_flag:
-                self._save_results(all_scraped_data, search_params)
-            elif self.stop_flag:
-                self._add_log("スクレイピングが停止されました")
-                self._update_status("スクレイピングが停止されました")
+            # リトライ上限に達したURLを報告
+            self._report_failures()
+            self._report_hit_rates()
+            self._report_reused()
+            
+            # 結果の保存（停止した場合も確定済みのページまでを保存する）
+            row_count = self.output_writer.row_count
+            if self.stop_flag:
+                self._save_stopped(row_count)
+            elif row_count:
+                self._save_results(row_count)
             else:
                 self._update_status("データが取得できませんでした。")
                 self._add_log("データが取得できませんでした。")
+                self._remove_checkpoint()
                 
         except Exception as e:
             self._add_log(f"エラーが発生しました: {e}")
             self._update_status(f"エラーが発生しました: {e}")
             
         finally:
+            self._close_output()
+            if self.shop_store:
+                self.shop_store.close()
+            if self.retry_scheduler:
+                self.retry_scheduler.stop()
+            if self.http_client:
+                self.http_client.close()
+            if self.parse_pool:
+                self.parse_pool.shutdown()
             if self.complete_callback:
                 self.complete_callback()
                 
@@ -142,6 +186,13 @@ class Scraper:
         filter_year_int = int(filter_year) if filter_year != '指定なし' else 0
         filter_month_int = int(filter_month) if filter_month != '指定なし' else 0
         
+        # 店舗詳細ページの同時取得数
+        detail_workers = int(search_params.get('detail_workers', Settings.DETAIL_WORKERS))
+        detail_workers = max(1, min(detail_workers, Settings.MAX_DETAIL_WORKERS))
+        
+        # 自動調整時は上限までワーカーを用意し、実際の同時接続数はスロットルで制御する
+        max_workers = Settings.MAX_DETAIL_WORKERS if Settings.ADAPTIVE_CONCURRENCY else detail_workers
+        
         return {
             'start_page': start_page,
             'end_page': end_page,
@@ -151,96 +202,701 @@ class Scraper:
             'middle_code': middle_code,
             'small_code': small_code,
             'filter_year': filter_year_int,
-            'filter_month': filter_month_int
+            'filter_month': filter_month_int,
+            'detail_workers': detail_workers,
+            'max_workers': max_workers,
+            'output_fields': self._parse_output_fields(search_params),
+            'output_format': search_params.get('output_format') or Settings.OUTPUT_FORMAT,
+            'delta_mode': search_params.get('delta_mode', Settings.DELTA_MODE),
+            'pages_done': 0
         }
         
+    def _parse_output_fields(self, search_params):
+        """出力する項目を取得（必須の項目は常に含め、Settings.SHOP_FIELDSの順に並べる）"""
+        selected = search_params.get('output_fields') or Settings.SHOP_FIELDS
+        return [
+            field for field in Settings.SHOP_FIELDS
+            if field in selected or field in Settings.REQUIRED_FIELDS
+        ]
+        
+    def _build_filters(self, params):
+        """店舗詳細ページの解析時に先に判定するフィルタを作成（項目名→値の合否を返す関数）"""
+        filters = {}
+        if params['filter_year'] > 0:
+            # 解析用プロセスに渡せるよう、ラムダではなくpartialで引数を束縛する
+            filters['オープン日'] = partial(
+                DateFilter.filter_by_opened_date,
+                filter_year=params['filter_year'],
+                filter_month=params['filter_month']
+            )
+        return filters
+        
+    def _create_parse_pool(self):
+        """設定に応じて店舗詳細ページ解析用のプロセスプールを作成（0の場合はNone）"""
+        if Settings.PARSE_PROCESSES <= 0:
+            return None
+        self._add_log(f"解析用プロセス数: {Settings.PARSE_PROCESSES}")
+        return ProcessPoolExecutor(max_workers=Settings.PARSE_PROCESSES)
+        
+    def _create_throttle(self, rate_limiter, params):
+        """同時接続数の自動調整を生成（無効時はNone）"""
+        if not Settings.ADAPTIVE_CONCURRENCY:
+            return None
+            
+        throttle = AdaptiveThrottle(
+            rate_limiter=rate_limiter,
+            initial_limit=params['detail_workers'],
+            max_limit=params['max_workers'],
+            on_change=self._update_concurrency
+        )
+        self._update_concurrency(throttle.limit, throttle.current_rate())
+        return throttle
+        
     def _get_prefecture_code(self, prefecture):
         """都道府県名から都道府県コードを取得"""
         if prefecture == "全国":
             return ""
         return prefectures_values.get(prefecture, "")
         
-    def _scrape_page(self, url, params):
-        """1ページをスクレイピング"""
-        try:
-            response = requests.get(url, timeout=Settings.REQUEST_TIMEOUT)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+    def _crawl(self, params):
+        """開始ページから一覧ページをたどって店舗を取得し、確定したページから順に出力ファイルへ追記"""
+        # URL生成
+        current_url = self._build_page_url(params, params['start_page'])
+        
+        self._update_status(f"スクレイピング開始: {current_url}")
+        self._add_log(f"URL: {current_url}")
+        
+        # 1ページ目を取得し、総件数から実際のページ数を算出
+        first_soup = self._fetch_list_page(current_url)
+        total_count = self._extract_total_count(first_soup) if first_soup else None
+        
+        if total_count is not None:
+            last_page = self._calculate_last_page(total_count, params)
+            total_pages = last_page - params['start_page'] + 1
+            self._add_log(f"総件数: {total_count} 件（{params['start_page']}～{last_page} ページ）")
+        else:
+            # 総件数が取得できない場合は「次へ」のリンクをたどる
+            last_page = None
+            total_pages = params['max_pages']
             
-            # 店舗リストを取得
-            shop_list = soup.find_all('div', class_='list-rst')
+        # 再開した場合は前回までに確定したページも進捗に含める
+        self._run_pipeline(current_url, first_soup, last_page, total_pages + params['pages_done'], params)
+        
+    def _run_pipeline(self, current_url, first_soup, last_page, total_pages, params):
+        """
+        一覧取得・詳細取得・フィルタと保存の3ステージをパイプラインで実行する
+        
+        ステージ間は上限付きのキューでつなぎ、後段が詰まった場合は前段を待たせる。
+        取得に失敗した店舗はリトライスケジューラーを経由して詳細取得のキューに戻る。
+        
+        Returns:
+            int: 出力ファイルに追記した店舗数
+        """
+        url_queue = queue.Queue(maxsize=Settings.PIPELINE_QUEUE_SIZE)
+        record_queue = queue.Queue(maxsize=Settings.PIPELINE_QUEUE_SIZE)
+        # 保存ステージが終了（エラーを含む）したら、キューへの追加を待っている他のステージも終了させる
+        done_event = self.pipeline_done = threading.Event()
+        
+        list_thread = threading.Thread(
+            target=self._list_stage,
+            args=(url_queue, record_queue, current_url, first_soup, last_page, params)
+        )
+        detail_threads = [
+            threading.Thread(target=self._detail_stage, args=(url_queue, record_queue, done_event))
+            for _ in range(params['max_workers'])
+        ]
+        stage_threads = [list_thread] + detail_threads
+        for thread in stage_threads:
+            thread.daemon = True
+            thread.start()
             
-            if not shop_list:
-                self._add_log("このページには店舗がありません。")
-                return None, None
+        try:
+            return self._store_stage(record_queue, total_pages, params, detail_threads)
+        finally:
+            # 一覧取得・詳細取得ステージに終了を知らせる
+            done_event.set()
+            for thread in stage_threads:
+                thread.join()
+                
+    def _list_stage(self, url_queue, record_queue, current_url, first_soup, last_page, params):
+        """一覧ページから店舗URLを取り出すステージ"""
+        pages = None
+        try:
+            if last_page is not None:
+                pages = self._iter_pages_parallel(first_soup, last_page, params)
+            else:
+                pages = self._iter_pages_sequential(current_url, first_soup, params)
+                
+            for page, cards in pages:
+                # カードで判定できるフィルタは詳細ページを取得する前に適用
+                shop_urls = self._select_cards(cards, params)
                 
-            self._add_log(f"ページで {len(shop_list)} 件の店舗を発見")
+                # 保存ステージにページの店舗数を先に知らせる
+                if not self._put(record_queue, ('page', page, len(shop_urls))):
+                    break
+                for index, shop_url in enumerate(shop_urls):
+                    # 再開前に取得済みの店舗と、差分取得で鮮度内の店舗は、詳細ページを取得せずに保存ステージへ送る
+                    resumed = self.resumed_records.pop(shop_url, None)
+                    stored = self._find_stored(self.parser, shop_url, params) if resumed is None else None
+                    if resumed is not None:
+                        queued = self._put(record_queue, ('shop', page, index, resumed))
+                    elif stored is not None:
+                        queued = self._put(record_queue, ('stored', page, index, stored))
+                    else:
+                        queued = self._put(url_queue, (page, index, shop_url, 0))
+                    if not queued:
+                        break
+                        
+        except Exception as e:
+            self._add_log(f"一覧ページの取得でエラーが発生しました: {e}")
+            
+        finally:
+            if pages is not None:
+                pages.close()
+            # 保存ステージに一覧の終了を知らせる
+            self._put(record_queue, ('list_done',))
             
-            page_data = []
-            parser = Parser()
+    def _detail_stage(self, url_queue, record_queue, done_event):
+        """店舗詳細ページを取得・解析するステージ（ワーカースレッドで実行）"""
+        while not self.stop_flag and not done_event.is_set():
+            try:
+                item = url_queue.get(timeout=Settings.QUEUE_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+                
+            page, index, shop_url, attempt = item
+            try:
+                record = self._fetch_shop_details(shop_url)
+            except Parser.RETRYABLE_ERRORS as e:
+                # 待機はスケジューラーに任せ、このワーカーは次の店舗へ進む
+                if self.retry_scheduler.schedule(
+                    lambda retry_item=(page, index, shop_url, attempt + 1): self._put(url_queue, retry_item),
+                    attempt + 1, shop_url, e
+                ):
+                    continue
+                record = None
+            except Exception as e:
+                self._add_log(f"{shop_url} の取得でエラーが発生しました: {e}")
+                self.retry_scheduler.add_failure(shop_url, e)
+                record = None
+            if not self._put(record_queue, ('shop', page, index, record)) and record is not None:
+                # 停止後も取得済みの店舗は保存ステージに渡し、再開時に再取得しないようにする
+                try:
+                    record_queue.put_nowait(('shop', page, index, record))
+                except queue.Full:
+                    pass
             
-            for i, shop in enumerate(shop_list):
-                if self.stop_flag:
+    def _store_stage(self, record_queue, total_pages, params, detail_threads=()):
+        """詳細データをフィルタし、一覧ページの順序で確定して出力ファイルに追記するステージ"""
+        saved_count = 0
+        pages = {}
+        page_order = deque()
+        pages_done = params['pages_done']
+        next_page = params['start_page']
+        checkpoint_at = time.monotonic()
+        list_done = False
+        
+        # 一覧が終了し、全ページの店舗がそろうまで受け取る
+        while not (list_done and not page_order) and not self.stop_flag:
+            try:
+                message = record_queue.get(timeout=Settings.QUEUE_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+                
+            if message[0] == 'page':
+                _, page, shop_count = message
+                pages[page] = {'expected': shop_count, 'records': {}, 'stored': set()}
+                page_order.append(page)
+            elif message[0] in ('shop', 'stored'):
+                _, page, index, shop_data = message
+                pages[page]['records'][index] = shop_data
+                if message[0] == 'stored':
+                    pages[page]['stored'].add(index)
+            else:
+                list_done = True
+                
+            # 全店舗がそろったページから一覧の順序で確定
+            finalized = False
+            while page_order and len(pages[page_order[0]]['records']) >= pages[page_order[0]]['expected']:
+                page = page_order.popleft()
+                page_state = pages.pop(page)
+                records = page_state['records']
+                page_data = []
+                fetched_data = []
+                for index in sorted(records):
+                    record = records[index]
+                    # 取得に失敗した店舗は含めない
+                    if record is None:
+                        continue
+                    # 詳細ページを取得した店舗は、フィルタで除外された場合も差分取得で再取得しないよう登録する
+                    if index not in page_state['stored']:
+                        fetched_data.append(record)
+                    # オープン日でフィルタリング
+                    shop_data = self.parser.finish(record)
+                    if shop_data is not None and self._filter_shop(shop_data, params):
+                        page_data.append(shop_data)
+                saved_count += self.output_writer.write_rows(page_data)
+                self._store_shops(fetched_data)
+                
+                pages_done += 1
+                next_page = page + 1
+                finalized = True
+                self._update_status(f"スクレイピング中: ページ {page} 完了（{pages_done}/{total_pages}）")
+                self._update_progress(pages_done, total_pages)
+                
+            # ページを確定した時と一定間隔ごとに、確定前のページで取得済みの店舗を含めて進行状況を保存
+            if finalized or time.monotonic() - checkpoint_at >= Settings.CHECKPOINT_INTERVAL:
+                self._save_checkpoint(next_page, self._pending_records(pages))
+                checkpoint_at = time.monotonic()
+                
+        if self.stop_flag:
+            # 取得中の店舗を待ち、停止までに取得した店舗も再開用に保存
+            for thread in detail_threads:
+                thread.join()
+            while True:
+                try:
+                    message = record_queue.get_nowait()
+                except queue.Empty:
                     break
+                if message[0] == 'page':
+                    pages[message[1]] = {'expected': message[2], 'records': {}, 'stored': set()}
+                elif message[0] == 'shop':
+                    _, page, index, shop_data = message
+                    pages[page]['records'][index] = shop_data
+            self._save_checkpoint(next_page, self._pending_records(pages))
+        return saved_count
+        
+    def _pending_records(self, pages):
+        """確定前のページで詳細ページを取得済みの店舗情報を返す"""
+        return [
+            shop_data
+            for page_state in pages.values()
+            for index, shop_data in page_state['records'].items()
+            if shop_data is not None and index not in page_state['stored']
+        ]
+        
+    def _put(self, target_queue, item):
+        """停止要求・パイプラインの終了を確認しながらキューに追加（追加できた場合はTrue）"""
+        while not self.stop_flag and not self.pipeline_done.is_set():
+            try:
+                target_queue.put(item, timeout=Settings.QUEUE_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+        
+    def _iter_pages_parallel(self, first_soup, last_page, params):
+        """総ページ数が分かっている場合に一覧ページを並列に先読みし、順番に返す"""
+        next_pages = iter(range(params['start_page'] + 1, last_page + 1))
+        
+        with ThreadPoolExecutor(max_workers=Settings.LIST_WORKERS) as executor:
+            # 先読みするページ数を制限し、取得済みの一覧ページを溜め込まない
+            window = deque([(params['start_page'], None)])
+            for page in islice(next_pages, Settings.LIST_WORKERS):
+                window.append((page, executor.submit(self._fetch_list_page, self._build_page_url(params, page))))
+                
+            try:
+                while window and not self.stop_flag:
+                    page, future = window.popleft()
+                    soup = first_soup if future is None else future.result()
                     
-                # 店舗URLを取得
-                detail_url_element = shop.find('a', class_='list-rst__rst-name-target') or \
-                                   shop.find('a', class_='list-rst__title-target')
-                                   
-                if detail_url_element and 'href' in detail_url_element.attrs:
-                    shop_url = detail_url_element['href']
-                    shop_data = parser.parse_shop_details(shop_url)
+                    # 次の一覧ページを先読み
+                    for next_page in islice(next_pages, 1):
+                        window.append((next_page, executor.submit(self._fetch_list_page, self._build_page_url(params, next_page))))
+                        
+                    self._add_log(f"ページ {page} をスクレイピング中")
+                    yield page, self._find_shop_cards(soup, params) if soup else []
                     
-                    # オープン日でフィルタリング
-                    if params['filter_year'] > 0:
-                        if DateFilter.filter_by_opened_date(
-                            shop_data.get('オープン日', ''), 
-                            params['filter_year'], 
-                            params['filter_month']
-                        ):
-                            page_data.append(shop_data)
-                            self._add_log(f"  {shop_data.get('店舗名', '不明')} - 追加")
-                    else:
-                        page_data.append(shop_data)
+            finally:
+                # 停止時は未着手の取得をキャンセル
+                for _, future in window:
+                    if future:
+                        future.cancel()
                         
-                time.sleep(Settings.SHOP_WAIT_TIME)
+    def _iter_pages_sequential(self, current_url, first_soup, params):
+        """「次へ」のリンクをたどって一覧ページを順番に返す"""
+        page_count = params['start_page']
+        pages_scraped = 0
+        soup = first_soup
+        
+        while current_url and page_count <= params['end_page'] and not self.stop_flag:
+            self._add_log(f"ページ {page_count} をスクレイピング中: {current_url}")
+            
+            if soup is None:
+                soup = self._fetch_list_page(current_url)
+                if soup is None:
+                    break
+                    
+            cards = self._find_shop_cards(soup, params)
+            if not cards:
+                break
                 
             # 次のページURLを取得
-            next_link = soup.find('a', class_='c-pagination__arrow c-pagination__arrow--next')
-            next_url = None
-            if next_link and 'href' in next_link.attrs:
-                next_url = next_link['href']
-                if not next_url.startswith("https://tabelog.com"):
-                    next_url = "https://tabelog.com" + next_url
+            next_url = self._extract_next_url(soup)
+            soup = None
+            
+            yield page_count, cards
+            pages_scraped += 1
+            
+            # 最大ページ数に達したかチェック
+            if pages_scraped >= params['max_pages']:
+                self._add_log(f"最大ページ数({params['max_pages']}ページ)に達しました。")
+                break
+                
+            # 次のページへ
+            if next_url:
+                current_url = next_url
+                page_count += 1
+            else:
+                self._add_log("次のページはありません。")
+                break
+                
+    def _fetch_list_page(self, url):
+        """一覧ページを取得して解析（失敗時はバックオフ付きでリトライ）"""
+        attempt = 0
+        while not self.stop_flag:
+            attempt += 1
+            try:
+                response = self.http_client.get(url)
+                response.raise_for_status()
+                return self._parse_list_page(response.content, response.encoding)
+                
+            except requests.exceptions.RequestException as e:
+                self._add_log(f'エラーが発生しました: {e}')
+                if attempt >= Settings.MAX_RETRIES:
+                    self.retry_scheduler.add_failure(url, e)
+                    return None
+                # 一覧は順番に処理するため、このステージだけが待機する
+                self._wait(self.retry_scheduler.backoff(attempt))
+        return None
+        
+    def _parse_list_page(self, content, encoding=None):
+        """
+        一覧ページのうち店舗リスト・件数・ページ送りの領域だけを解析
+        
+        BeautifulSoupにバイト列を渡すと文字コードを判定し直すため、宣言された文字コードで1回だけデコードする。
+        
+        Args:
+            content (bytes): ページの本文
+            encoding (str): 本文の文字コード（Noneの場合はmeta要素の宣言、なければUTF-8）
+        """
+        if isinstance(content, bytes):
+            content = content.decode(encoding or declared_encoding(None, content), errors='replace')
+        return BeautifulSoup(content, 'html.parser', parse_only=self.LIST_STRAINER)
+        
+    def _wait(self, seconds):
+        """停止要求を確認しながら待機"""
+        deadline = time.monotonic() + seconds
+        while not self.stop_flag and time.monotonic() < deadline:
+            time.sleep(min(Settings.QUEUE_POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+            
+    def _find_shop_cards(self, soup, params):
+        """一覧ページから店舗のカードを取得"""
+        # 店舗リストを取得
+        shop_list = soup.find_all('div', class_='list-rst')
+        
+        if not shop_list:
+            self._add_log("このページには店舗がありません。")
+            return []
+            
+        self._add_log(f"ページで {len(shop_list)} 件の店舗を発見")
+        return self._extract_shop_cards(shop_list, params)
+        
+    def _build_page_url(self, params, page):
+        """指定ページの一覧ページURLを生成"""
+        return URLBuilder.build(
+            prefecture_code=params['prefecture_code'],
+            middle_code=params['middle_code'],
+            small_code=params['small_code'],
+            start_page=page,
+            new_open_mode=params['new_open_mode']
+        )
+        
+    def _extract_total_count(self, soup):
+        """一覧ページから検索結果の総件数を取得"""
+        # 「1～20 件 / 全 1,234 件」の最後の数値が総件数
+        count_elements = soup.find_all('span', class_='c-page-count__num')
+        if not count_elements:
+            return None
+            
+        digits = re.sub(r'\D', '', count_elements[-1].get_text())
+        return int(digits) if digits else None
+        
+    def _calculate_last_page(self, total_count, params):
+        """総件数から取得する最終ページを算出"""
+        total_pages = min(math.ceil(total_count / Settings.LIST_PAGE_SIZE), Settings.LIST_MAX_PAGE)
+        return max(params['start_page'], min(params['end_page'], total_pages))
+        
+    def _extract_shop_cards(self, shop_list, params):
+        """店舗リストから店舗詳細ページのURLとカードに表示された情報を取得"""
+        cards = []
+        for shop in shop_list:
+            detail_url_element = shop.find('a', class_='list-rst__rst-name-target') or \
+                               shop.find('a', class_='list-rst__title-target')
+                               
+            if detail_url_element and 'href' in detail_url_element.attrs:
+                area_genre_element = shop.find('div', class_='list-rst__area-genre')
+                opened_date = None
+                if params['new_open_mode']:
+                    match = self.CARD_OPENED_DATE_PATTERN.search(shop.get_text())
+                    opened_date = match.group() if match else None
                     
-            return page_data, next_url
+                cards.append(ShopCard(
+                    url=detail_url_element['href'],
+                    name=detail_url_element.get_text(strip=True),
+                    area_genre=area_genre_element.get_text(strip=True) if area_genre_element else None,
+                    opened_date=opened_date
+                ))
+        return cards
+        
+    def _select_cards(self, cards, params):
+        """カードで判定できるフィルタを適用し、詳細ページを取得するURLを返す"""
+        shop_urls = [card.url for card in cards if self._filter_card(card, params)]
+        skipped = len(cards) - len(shop_urls)
+        if skipped:
+            self._add_log(f"  一覧の情報で {skipped} 件を除外しました（詳細ページの取得を省略）")
+        return shop_urls
+        
+    def _filter_card(self, card, params):
+        """カードの情報でフィルタを判定（判定できない場合は詳細ページで判定するためTrue）"""
+        if params['filter_year'] > 0 and card.opened_date:
+            return DateFilter.filter_by_opened_date(
+                card.opened_date,
+                params['filter_year'],
+                params['filter_month']
+            )
+        return True
+        
+    def _extract_next_url(self, soup):
+        """次のページのURLを取得"""
+        next_link = soup.find('a', class_='c-pagination__arrow c-pagination__arrow--next')
+        next_url = None
+        if next_link and 'href' in next_link.attrs:
+            next_url = next_link['href']
+            if not next_url.startswith("https://tabelog.com"):
+                next_url = "https://tabelog.com" + next_url
+        return next_url
+        
+    def _filter_shop(self, shop_data, params):
+        """オープン日フィルタに合致するか判定"""
+        if params['filter_year'] <= 0:
+            return True
             
-        except requests.exceptions.RequestException as e:
-            self._add_log(f'エラーが発生しました: {e}')
-            return None, None
+        if DateFilter.filter_by_opened_date(
+            shop_data.get('オープン日', ''), 
+            params['filter_year'], 
+            params['filter_month']
+        ):
+            self._add_log(f"  {shop_data.get('店舗名', '不明')} - 追加")
+            return True
+        return False
+        
+    def _fetch_shop_details(self, shop_url):
+        """店舗詳細ページの解析結果を取得（ワーカースレッドで実行、フィルタは保存ステージで適用）"""
+        if self.stop_flag:
+            return None
             
-    def _save_results(self, data, search_params):
-        """結果を保存"""
-        self._update_status("データをExcelに保存中...")
-        self._add_log(f"合計 {len(data)} 件のデータを保存中...")
+        return self.parser.fetch_record(shop_url)
         
+    def _report_failures(self):
+        """リトライ上限に達したURLをログに出力"""
+        failures = self.retry_scheduler.failures
+        if not failures:
+            return
+            
+        self._add_log(f"取得に失敗したURL: {len(failures)} 件")
+        for url, error in failures:
+            self._add_log(f"  {url} - {error}")
+            
+    def _report_hit_rates(self):
+        """正規表現による高速抽出の項目ごとのヒット率をログに出力"""
+        hit_rates = RegexExtractor.hit_rates()
+        if not hit_rates:
+            return
+            
+        self._add_log("高速抽出のヒット率（低下している項目はマークアップが変更された可能性があります）:")
+        for field, (rate, hits, fallbacks, absent) in hit_rates.items():
+            rate_text = f"{rate:.0%}" if rate is not None else "-"
+            self._add_log(f"  {field}: {rate_text}（正規表現 {hits} 件 / DOMで補完 {fallbacks} 件 / 記載なし {absent} 件）")
+            
+    def _open_output(self, search_params, params, resume=None):
+        """出力ファイルを開く（確定したページから順に追記する。再開する場合は前回の途中経過ファイルに追記する）"""
         file_handler = FileHandler()
-        file_path = file_handler.save_to_excel(data, search_params)
+        self.output_writer = file_handler.open_writer(
+            search_params, params['output_fields'], params['output_format'], resume
+        )
+        
+    def _create_checkpoint(self):
+        """出力ファイルに対応するチェックポイントを作成（無効な場合はNone）"""
+        if not Settings.CHECKPOINT_ENABLED:
+            return None
+        return Checkpoint.for_output(self.output_writer.file_path)
+        
+    def _load_resume(self, search_params):
+        """
+        再開が指定された場合、保存先フォルダから同じ検索条件のチェックポイントを探して読み込む
+        
+        同じ検索条件のものが複数ある場合は最後に保存されたものを使う。
+        見つからない場合は、フォルダにあるチェックポイントをログに一覧表示する。
+        
+        Returns:
+            dict: 前回の進行状況（再開できない場合はNone）
+        """
+        if not search_params.get('resume') or not Settings.CHECKPOINT_ENABLED:
+            return None
+            
+        save_dir = search_params.get('save_path', Settings.DEFAULT_SAVE_PATH)
+        found = Checkpoint.find(save_dir)
+        candidates = [state for _, state in found if Checkpoint.matches(state, search_params)]
+        if not candidates:
+            if not found:
+                self._add_log("再開できるチェックポイントがないため、最初から取得します")
+                return None
+            self._add_log("検索条件が一致するチェックポイントがないため、最初から取得します。保存先フォルダのチェックポイント:")
+            for checkpoint, state in found:
+                saved_params = state['search_params']
+                area = '・'.join(filter(None, (saved_params.get(key) for key in ('prefecture', 'middle', 'small'))))
+                self._add_log(
+                    f"  {checkpoint.path.name}: {area or '全国'}（ページ {state['next_page']} から、確定済み {state['row_count']} 件）"
+                )
+            return None
+            
+        state = candidates[0]
+        
+        # 確定済みの店舗は途中経過ファイルにあるため、ファイルがない場合は再開できない
+        partial_path = Path(state['partial_path'])
+        if state['row_count'] and (not partial_path.exists() or partial_path.stat().st_size < state['partial_size']):
+            self._add_log(f"途中経過ファイルが見つからないため、最初から取得します: {partial_path}")
+            return None
+            
+        self._add_log(f"前回の続きから再開します（ページ {state['next_page']} から、確定済み {state['row_count']} 件）")
+        return state
+        
+    def _resume_params(self, params, state):
+        """チェックポイントの次のページから取得するようパラメータを変更し、確定前のページで取得済みの店舗を引き継ぐ"""
+        params['pages_done'] = state['next_page'] - params['start_page']
+        params['max_pages'] -= params['pages_done']
+        params['start_page'] = state['next_page']
+        self.resumed_records = dict(state['pending'])
+        
+    def _save_checkpoint(self, next_page, pending=()):
+        """
+        クロールの進行状況を保存
+        
+        Args:
+            next_page (int): 次に確定するページ
+            pending (list): 確定前のページで取得済みの店舗情報
+        """
+        if self.checkpoint is None:
+            return
+        # 再開前に取得済みで、まだ一覧に現れていない店舗も引き継ぐ
+        pending_records = self.resumed_records.copy()
+        pending_records.update((shop_data['URL'], shop_data) for shop_data in pending)
+        try:
+            self.checkpoint.save({
+                'search_params': self.search_params,
+                'next_page': next_page,
+                'output_path': str(self.output_writer.file_path),
+                'partial_path': str(self.output_writer.partial_path),
+                'partial_size': self.output_writer.partial_size,
+                'row_count': self.output_writer.row_count,
+                'pending': pending_records
+            })
+        except OSError as e:
+            self._add_log(f"チェックポイントの保存でエラーが発生しました: {e}")
+            
+    def _remove_checkpoint(self):
+        """クロールが完了したためチェックポイントを削除"""
+        if self.checkpoint:
+            self.checkpoint.remove()
+        
+    def _create_shop_store(self, search_params):
+        """保存先フォルダの店舗データベースを開く（無効な場合はNone）"""
+        if not Settings.SHOP_STORE_ENABLED:
+            return None
+        save_dir = search_params.get('save_path', Settings.DEFAULT_SAVE_PATH)
+        return ShopStore(str(Path(save_dir) / f"{Settings.SHOP_STORE_NAME}.sqlite"))
+        
+    def _store_shops(self, shops):
+        """
+        確定したページの店舗を店舗データベースに登録・更新
+        
+        差分取得で店舗データベースから再利用した店舗は含めない（更新日時を進めると再取得されなくなるため）。
+        """
+        if self.shop_store and shops:
+            self.shop_store.upsert_many(shops)
+            
+    def _find_stored(self, parser, shop_url, params):
+        """
+        差分取得で詳細ページの取得を省略できる店舗の、店舗データベースの店舗情報を返す
+        
+        Settings.DELTA_FRESHNESS_WINDOW以内に取得済みで、出力・フィルタに必要な項目が揃っている場合に限る。
+        
+        Returns:
+            dict: 店舗情報（省略できない場合はNone）
+        """
+        if not params['delta_mode'] or not self.shop_store:
+            return None
+        record = self.shop_store.get(shop_url, max_age=Settings.DELTA_FRESHNESS_WINDOW)
+        if record is None or not parser.covers(record):
+            return None
+        self.reused_count += 1
+        return record
+        
+    def _report_reused(self):
+        """差分取得で詳細ページの取得を省略した店舗数をログに出力"""
+        if self.reused_count:
+            self._add_log(f"差分取得: {self.reused_count} 件の店舗は店舗データベースの情報を使用しました（詳細ページの取得を省略）")
+            
+            
+    def _close_output(self):
+        """出力ファイルを作成せずに終了する場合、確定済みのデータを残したファイルを知らせる"""
+        if self.output_writer is None:
+            return
+        partial_path = self.output_writer.abort()
+        if partial_path:
+            self._add_log(f"確定済みの {self.output_writer.row_count} 件を途中経過ファイルに保存しました: {partial_path}")
+            
+    def _save_results(self, saved_count):
+        """追記済みの結果を出力ファイルとして保存"""
+        self._update_status("データをファイルに保存中...")
+        self._add_log(f"合計 {saved_count} 件のデータを保存中...")
+        
+        file_path = self.output_writer.close()
         
         if file_path:
             file_name = file_path.name
             save_dir = file_path.parent
             self._update_status("スクレイピングが完了しました。")
             self._add_log(f"スクレイピングが完了しました。\nファイル名: {file_name}\n保存先: {save_dir}")
+            self._remove_checkpoint()
         else:
             self._update_status("ファイルの保存に失敗しました。")
             self._add_log("ファイルの保存に失敗しました。")
             
+    def _save_stopped(self, row_count):
+        """停止した場合に確定済みのページまでを出力ファイルとして保存（途中経過ファイルとチェックポイントは再開用に残す）"""
+        self._add_log("スクレイピングが停止されました")
+        self._update_status("スクレイピングが停止されました")
+        if not row_count:
+            return
+            
+        file_path = self.output_writer.export()
+        if file_path:
+            self._add_log(f"停止までに確定した {row_count} 件を保存しました: {file_path}")
+        if self.checkpoint:
+            self._add_log("同じ検索条件で「前回の続きから再開」を選んで開始すると、停止したところから取得を続けます")
+            
     def _update_progress(self, current, total):
         """進捗を更新"""
         if self.progress_callback:
             self.progress_callback(current, total)
             
+    def _update_concurrency(self, limit, rate):
+        """同時接続数とリクエストレートを更新"""
+        if self.concurrency_callback:
+            self.concurrency_callback(limit, rate)
+            
     def _update_status(self, text):
         """ステータスを更新"""
         if self.status_callback:
@@ -0,0 +1,146 @@
+"""
+同時接続数の自動調整機能
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+from config import Settings
+
+
+class AdaptiveThrottle:
+    """AIMD方式で同時接続数とリクエストレートを調整するクラス
+    
+    応答が健全な間は同時接続数を1ずつ増やし（加算的増加）、
+    429/503やタイムアウトを受けると半分に減らす（乗算的減少）。
+    """
+    
+    THROTTLE_STATUS_CODES = (429, 503)
+    
+    def __init__(self, rate_limiter=None, initial_limit=None, max_limit=None, on_change=None):
+        """
+        Args:
+            rate_limiter (RateLimiter): 連動して調整するレート制限
+            initial_limit (int): 同時接続数の初期値
+            max_limit (int): 同時接続数の上限
+            on_change (callable): 同時接続数・レート変更時に (limit, rate) で呼ばれる関数
+        """
+        self.rate_limiter = rate_limiter
+        self.max_limit = max_limit or Settings.MAX_DETAIL_WORKERS
+        self.limit = max(Settings.AIMD_MIN_LIMIT, min(initial_limit or Settings.DETAIL_WORKERS, self.max_limit))
+        self.on_change = on_change
+        
+        self.in_flight = 0
+        self.success_count = 0
+        self.last_decrease_at = 0.0
+        self.condition = threading.Condition()
+        
+    def acquire(self):
+        """同時接続数に空きができるまで待機する"""
+        with self.condition:
+            while self.in_flight >= self.limit:
+                self.condition.wait()
+            self.in_flight += 1
+            
+    def try_acquire(self):
+        """空きがあれば枠を確保する（待機しない）"""
+        with self.condition:
+            if self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            return True
+            
+    def release(self):
+        """確保した枠を解放する"""
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify()
+            
+    def record_response(self, status_code, latency, retry_after=None):
+        """
+        レスポンスの結果を記録して同時接続数を調整する
+        
+        Args:
+            status_code (int): HTTPステータスコード
+            latency (float): 応答時間（秒）
+            retry_after (str): Retry-Afterヘッダーの値
+        """
+        if status_code in self.THROTTLE_STATUS_CODES:
+            self._decrease(self._parse_retry_after(retry_after))
+        elif latency > Settings.AIMD_LATENCY_THRESHOLD:
+            # 応答が遅い間は増やさない
+            with self.condition:
+                self.success_count = 0
+        else:
+            self._increase()
+            
+    def record_timeout(self):
+        """タイムアウトを記録して同時接続数を減らす"""
+        self._decrease()
+        
+    def current_rate(self):
+        """現在のリクエストレートを返す"""
+        return self.rate_limiter.rate if self.rate_limiter else 0.0
+        
+    def _increase(self):
+        """同時接続数とレートを加算的に増やす"""
+        with self.condition:
+            self.success_count += 1
+            # 現在の同時接続数分の成功が続いたら1段階増やす
+            if self.success_count < self.limit:
+                return
+            self.success_count = 0
+            changed = False
+            if self.limit < self.max_limit:
+                self.limit += 1
+                self.condition.notify()
+                changed = True
+            if self.rate_limiter and self.rate_limiter.rate < Settings.MAX_REQUESTS_PER_SECOND:
+                self.rate_limiter.set_rate(
+                    min(Settings.MAX_REQUESTS_PER_SECOND, self.rate_limiter.rate + Settings.AIMD_RATE_STEP)
+                )
+                changed = True
+        if changed:
+            self._notify_change()
+            
+    def _decrease(self, pause_seconds=0.0):
+        """同時接続数とレートを乗算的に減らす"""
+        with self.condition:
+            now = time.monotonic()
+            if pause_seconds and self.rate_limiter:
+                self.rate_limiter.pause(pause_seconds)
+            # 同じ混雑に対する連続したエラーで何度も減らさない
+            if now - self.last_decrease_at < Settings.AIMD_DECREASE_COOLDOWN:
+                return
+            self.last_decrease_at = now
+            self.success_count = 0
+            self.limit = max(Settings.AIMD_MIN_LIMIT, int(self.limit * Settings.AIMD_DECREASE_FACTOR))
+            if self.rate_limiter:
+                self.rate_limiter.set_rate(
+                    max(Settings.MIN_REQUESTS_PER_SECOND, self.rate_limiter.rate * Settings.AIMD_DECREASE_FACTOR)
+                )
+        self._notify_change()
+        
+    def _notify_change(self):
+        """変更を通知"""
+        if self.on_change:
+            self.on_change(self.limit, self.current_rate())
+            
+    @staticmethod
+    def _parse_retry_after(value):
+        """Retry-Afterヘッダー（秒数またはHTTP日付）を秒数に変換"""
+        if not value:
+            return 0.0
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return 0.0
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
\ No newline at end of file
@@ -4,6 +4,9 @@
 
 from .date_filter import DateFilter
 from .file_handler import FileHandler
+from .output_writers import OutputWriter, OUTPUT_WRITERS, available_formats
+from .shop_store import ShopStore
+from .checkpoint import Checkpoint
 from .logger import Logger
 
-__all__ = ['DateFilter', 'FileHandler', 'Logger']
\ No newline at end of file
+__all__ = ['DateFilter', 'FileHandler', 'OutputWriter', 'OUTPUT_WRITERS', 'available_formats', 'ShopStore', 'Checkpoint', 'Logger']
\ No newline at end of file
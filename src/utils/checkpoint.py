@@ -0,0 +1,109 @@
+"""
+クロールのチェックポイント機能
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from config import Settings
+
+
+class Checkpoint:
+    """クロールの進行状況を保存先フォルダのJSONファイルに保存するクラス
+    
+    一時ファイルに書き込んでから置き換えるため、保存中に異常終了しても直前のチェックポイントが残る。
+    確定済みの店舗は出力の途中経過ファイルにあるため、チェックポイントにはその位置と、
+    次に確定するページ・確定前のページで取得済みの店舗だけを保存する。
+    ファイル名は出力ファイルごとに付けるため、同じフォルダへの別のクロールで上書きされない。
+    """
+    
+    VERSION = 1
+    
+    # 再開するクロールを選ぶ際に一致を確認する検索パラメータ（取得範囲と出力ファイルの形式を決めるもの）
+    SEARCH_KEYS = (
+        'prefecture', 'middle', 'small', 'start_page', 'fifty_page_mode', 'new_open_mode',
+        'filter_year', 'filter_month', 'output_format', 'output_fields'
+    )
+    
+    def __init__(self, path):
+        """
+        Args:
+            path (str): チェックポイントファイルのパス
+        """
+        self.path = Path(path)
+        self.temp_path = self.path.with_name(self.path.name + '.tmp')
+        
+    @classmethod
+    def for_output(cls, file_path):
+        """
+        出力ファイルに対応するチェックポイントを返す
+        
+        Args:
+            file_path (Path): 出力ファイルのパス（例: 東京都_scraped_data_20250101_120000.xlsx）
+            
+        Returns:
+            Checkpoint: 出力ファイルと同じフォルダ・同じ名前のチェックポイント（例: 〜_120000.checkpoint.json）
+        """
+        file_path = Path(file_path)
+        return cls(file_path.with_name(file_path.stem + Settings.CHECKPOINT_SUFFIX))
+        
+    @classmethod
+    def find(cls, save_dir):
+        """
+        フォルダにあるチェックポイントを読み込む
+        
+        Args:
+            save_dir (str): 保存先フォルダ
+            
+        Returns:
+            list: (Checkpoint, 進行状況) のリスト（保存日時の新しい順）
+        """
+        found = []
+        for path in Path(save_dir).glob(f"*{Settings.CHECKPOINT_SUFFIX}"):
+            checkpoint = cls(path)
+            state = checkpoint.load()
+            if state is not None:
+                found.append((checkpoint, state))
+        return sorted(found, key=lambda item: item[1]['saved_at'], reverse=True)
+        
+    @classmethod
+    def matches(cls, state, search_params):
+        """チェックポイントが同じ検索条件のクロールのものか"""
+        saved_params = state['search_params']
+        return all(saved_params.get(key) == search_params.get(key) for key in cls.SEARCH_KEYS)
+        
+    def load(self):
+        """
+        保存されたチェックポイントを読み込む
+        
+        Returns:
+            dict: 進行状況（ない場合・読み込めない場合はNone）
+        """
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get('version') != self.VERSION:
+            return None
+        return state
+        
+    def save(self, state):
+        """
+        進行状況を保存する
+        
+        Args:
+            state (dict): 進行状況（JSONに変換できる値）
+        """
+        with open(self.temp_path, 'w', encoding='utf-8') as f:
+            json.dump({**state, 'version': self.VERSION, 'saved_at': time.time()}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self.temp_path, self.path)
+        
+    def remove(self):
+        """チェックポイントを削除する（クロールが完了した場合）"""
+        self.path.unlink(missing_ok=True)
+        self.temp_path.unlink(missing_ok=True)
\ No newline at end of file
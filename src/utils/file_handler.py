@@ -3,49 +3,46 @@
 """
 
 import os
-import pandas as pd
 from datetime import datetime
 from pathlib import Path
 
 from config import Settings
+from .output_writers import OUTPUT_WRITERS
 
 
 class FileHandler:
     """ファイルハンドラークラス"""
     
-    def save_to_excel(self, data, search_params):
-        """データをExcelファイルとして保存"""
-        try:
-            # DataFrameの作成
-            df = pd.DataFrame(data)
-            
-            # 空のデータを除外
-            df = df[df['店舗名'] != Settings.NO_DATA_VALUE]
-            
-            if df.empty:
-                return None
-                
-            # ファイル名の生成
-            file_name = self._generate_filename(search_params)
-            
-            # 保存先パスの生成
-            save_dir = search_params.get('save_path', Settings.DEFAULT_SAVE_PATH)
-            file_path = Path(save_dir) / file_name
-            
-            # Excelファイルとして保存
-            df.to_excel(
-                file_path, 
-                index=Settings.EXCEL_INDEX,
-                engine=Settings.EXCEL_ENGINE
-            )
+    def open_writer(self, search_params, fields=None, output_format=None, resume=None):
+        """
+        ページ単位で追記する出力を開始
+        
+        Args:
+            search_params (dict): 検索パラメータ
+            fields (list): 出力する列（Noneの場合はSettings.SHOP_FIELDSの全項目）
+            output_format (str): 出力形式（Noneの場合はSettings.OUTPUT_FORMAT）
+            resume (dict): 再開するチェックポイント（出力ファイルのパス、途中経過ファイルのサイズと行数）
             
-            return file_path
+        Returns:
+            OutputWriter: 追記用のライター
+        """
+        output_format = output_format or Settings.OUTPUT_FORMAT
+        writer_class = OUTPUT_WRITERS.get(output_format)
+        if writer_class is None:
+            raise ValueError(f"未対応の出力形式です: {output_format}")
+        if not writer_class.available():
+            raise ValueError(f"{output_format}形式での出力に必要なライブラリがインストールされていません")
             
-        except Exception as e:
-            print(f"ファイル保存エラー: {e}")
-            return None
+        # 再開する場合は前回と同じファイル名で、確定済みの行がある途中経過ファイルに追記する
+        if resume:
+            resume_size = resume['partial_size'] if resume['row_count'] else None
+            return writer_class(resume['output_path'], fields, resume_size, resume['row_count'])
             
-    def _generate_filename(self, search_params):
+        file_name = self._generate_filename(search_params, writer_class.EXTENSION)
+        save_dir = search_params.get('save_path', Settings.DEFAULT_SAVE_PATH)
+        return writer_class(Path(save_dir) / file_name, fields)
+        
+    def _generate_filename(self, search_params, extension='.xlsx'):
         """ファイル名を生成"""
         # タイムスタンプ
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -86,6 +83,6 @@ class FileHandler:
                 
         # ファイル名の組み立て
         prefix = "_".join(parts)
-        file_name = f"{prefix}_scraped_data_{timestamp}.xlsx"
+        file_name = f"{prefix}_scraped_data_{timestamp}{extension}"
         
         return file_name
\ No newline at end of file
@@ -0,0 +1,306 @@
+"""
+出力形式ごとのファイル書き込み処理
+"""
+
+import csv
+import json
+import os
+import shutil
+from pathlib import Path
+from openpyxl import Workbook
+
+from config import Settings
+
+# Parquet形式での出力はpyarrowがインストールされている場合のみ使用できる
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+class OutputWriter:
+    """店舗情報をページ単位で追記する出力の基底クラス
+    
+    確定したページは途中経過ファイルに追記してディスクに書き出し、close時に出力ファイルにする。
+    メモリに保持するのは追記中の1ページ分だけで、異常終了しても確定済みのページはファイルに残る。
+    サブクラスは拡張子と、途中経過ファイルへの追記・出力ファイルへの変換を実装する。
+    """
+    
+    # 出力ファイルの拡張子
+    EXTENSION = None
+    
+    # 途中経過ファイルの拡張子
+    PARTIAL_EXTENSION = None
+    
+    def __init__(self, file_path, fields=None, resume_size=None, row_count=0):
+        """
+        Args:
+            file_path (Path): 保存するファイルのパス（拡張子は出力形式のものに置き換える）
+            fields (list): 出力する列（Noneの場合はSettings.SHOP_FIELDSの全項目）
+            resume_size (int): 再開する場合の途中経過ファイルのサイズ（この位置より後ろは破棄して追記する）
+            row_count (int): 再開する場合の途中経過ファイルの行数
+        """
+        self.file_path = Path(file_path).with_suffix(self.EXTENSION)
+        self.partial_path = self.file_path.with_name(
+            self.file_path.stem + Settings.PARTIAL_FILE_SUFFIX + self.PARTIAL_EXTENSION
+        )
+        self.fields = list(fields or Settings.SHOP_FIELDS)
+        self.row_count = 0
+        self.partial_size = 0
+        self.closed = False
+        
+        if resume_size is not None:
+            # チェックポイントの後に書き込みかけた内容は破棄する
+            os.truncate(self.partial_path, resume_size)
+            self.row_count = row_count
+        self.file = self._open_partial(append=resume_size is not None)
+        self._sync()
+        
+    @classmethod
+    def available(cls):
+        """必要なライブラリがインストールされているか"""
+        return True
+        
+    def write_rows(self, rows):
+        """
+        確定したページの店舗情報を追記
+        
+        Args:
+            rows (list): 店舗情報のリスト（フィルタの判定のみに使った項目は出力しない）
+            
+        Returns:
+            int: 追記した行数（店舗名を取得できなかった行は除外）
+        """
+        rows = [row for row in rows if row.get('店舗名') != Settings.NO_DATA_VALUE]
+        if rows:
+            self._append(rows)
+            self._sync()
+            self.row_count += len(rows)
+        return len(rows)
+        
+    def export(self):
+        """
+        追記を続けたまま、ここまでの途中経過ファイルから出力ファイルを作成
+        
+        Returns:
+            Path: 保存したファイルのパス（データがない場合・失敗した場合はNone）
+        """
+        if self.closed or not self.row_count:
+            return None
+        try:
+            self._export()
+        except Exception as e:
+            print(f"ファイル保存エラー: {e}")
+            return None
+        return self.file_path
+        
+    def close(self):
+        """
+        途中経過ファイルを出力ファイルにして保存
+        
+        Returns:
+            Path: 保存したファイルのパス（データがない場合・失敗した場合はNone）
+        """
+        if self.closed:
+            return None
+        self.closed = True
+        self._close_partial()
+        if not self.row_count:
+            self.partial_path.unlink(missing_ok=True)
+            return None
+            
+        try:
+            self._finish()
+        except Exception as e:
+            # 途中経過ファイルは残す
+            print(f"ファイル保存エラー: {e}")
+            return None
+        return self.file_path
+        
+    def abort(self):
+        """
+        出力ファイルを作成せずに終了
+        
+        Returns:
+            Path: 確定済みのデータを残した途中経過ファイルのパス（データがない場合はNone）
+        """
+        if self.closed:
+            return None
+        self.closed = True
+        self._close_partial()
+        if not self.row_count:
+            self.partial_path.unlink(missing_ok=True)
+            return None
+        return self.partial_path
+        
+    def _sync(self):
+        """追記した内容をディスクに書き出す"""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.partial_size = os.fstat(self.file.fileno()).st_size
+        
+    def _open_partial(self, append=False):
+        """途中経過ファイルを開く（appendの場合は既存の内容に追記する）"""
+        raise NotImplementedError
+        
+    def _append(self, rows):
+        """途中経過ファイルに行を追記"""
+        raise NotImplementedError
+        
+    def _close_partial(self):
+        """途中経過ファイルを閉じる"""
+        self.file.close()
+        
+    def _export(self):
+        """途中経過ファイルを残したまま出力ファイルを作成（そのまま使える形式は複製するだけ）"""
+        shutil.copyfile(self.partial_path, self.file_path)
+        
+    def _finish(self):
+        """途中経過ファイルを出力ファイルにする（そのまま使える形式は名前を変更するだけ）"""
+        self.partial_path.replace(self.file_path)
+
+
+class CsvWriter(OutputWriter):
+    """CSV形式の出力（Excelで直接開けるようBOM付きUTF-8）"""
+    
+    EXTENSION = '.csv'
+    PARTIAL_EXTENSION = '.csv'
+    
+    def _open_partial(self, append=False):
+        """途中経過ファイルを開いて見出し行を書き込む（追記する場合は見出し行・BOMを書き込まない）"""
+        file = open(self.partial_path, 'a' if append else 'w', encoding='utf-8-sig', newline='')
+        self.writer = csv.writer(file)
+        if not append:
+            self.writer.writerow(self.fields)
+        return file
+        
+    def _append(self, rows):
+        """途中経過ファイルに行を追記"""
+        self.writer.writerows([row.get(field) for field in self.fields] for row in rows)
+
+
+class ExcelWriter(CsvWriter):
+    """Excel形式の出力
+    
+    xlsxは閉じるまで有効なファイルにならないため、途中経過はCSVに追記し、
+    close時にopenpyxlの書き込み専用モードで1行ずつxlsxに変換する。
+    """
+    
+    EXTENSION = '.xlsx'
+    
+    def _export(self):
+        """途中経過ファイルをExcelファイルに変換"""
+        # 書き込み専用モードは行をそのままファイルに書き出すため、件数によらずメモリ使用量は一定
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(Settings.EXCEL_SHEET_NAME)
+        with open(self.partial_path, encoding='utf-8-sig', newline='') as f:
+            for row in csv.reader(f):
+                sheet.append([value or None for value in row])
+        workbook.save(self.file_path)
+        
+    def _finish(self):
+        """途中経過ファイルをExcelファイルに変換して削除"""
+        self._export()
+        self.partial_path.unlink()
+
+
+class JsonLinesWriter(OutputWriter):
+    """JSON Lines形式の出力（1行に1店舗のJSONオブジェクト）"""
+    
+    EXTENSION = '.jsonl'
+    PARTIAL_EXTENSION = '.jsonl'
+    
+    def _open_partial(self, append=False):
+        """途中経過ファイルを開く"""
+        return open(self.partial_path, 'a' if append else 'w', encoding='utf-8')
+        
+    def _append(self, rows):
+        """途中経過ファイルに行を追記"""
+        self.file.writelines(
+            json.dumps({field: row.get(field) for field in self.fields}, ensure_ascii=False) + '\n'
+            for row in rows
+        )
+
+
+class ParquetWriter(OutputWriter):
+    """Parquet形式の出力（列指向、要pyarrow）
+    
+    Parquetはフッターを書き込むまで読めないため、途中経過はArrowのストリーム形式に
+    ページごとのバッチとして追記し（途中で終了しても書き込み済みのバッチは読める）、
+    close時にSettings.PARQUET_ROW_GROUP_SIZE行ずつの行グループにまとめてParquetに変換する。
+    """
+    
+    EXTENSION = '.parquet'
+    PARTIAL_EXTENSION = '.arrow'
+    
+    @classmethod
+    def available(cls):
+        """pyarrowがインストールされているか"""
+        return pa is not None
+        
+    def _open_partial(self, append=False):
+        """途中経過ファイルを開く"""
+        # 値は全て文字列として出力する
+        self.schema = pa.schema([(field, pa.string()) for field in self.fields])
+        previous_path = self.partial_path.with_name(self.partial_path.name + '.old')
+        if append:
+            # ストリームの途中からは追記できないため、書き込み済みのバッチを新しいストリームに移す
+            self.partial_path.replace(previous_path)
+        file = open(self.partial_path, 'wb')
+        self.stream = pa.ipc.new_stream(file, self.schema)
+        if append:
+            for batch in self._read_batches(previous_path):
+                self.stream.write_batch(batch)
+            previous_path.unlink()
+        return file
+        
+    def _append(self, rows):
+        """途中経過ファイルにページのバッチを追記"""
+        self.stream.write_batch(pa.RecordBatch.from_pylist(rows, schema=self.schema))
+        
+    def _close_partial(self):
+        """ストリームの終端を書き込んで途中経過ファイルを閉じる"""
+        self.stream.close()
+        self.file.close()
+        
+    def _export(self):
+        """途中経過ファイルをParquetに変換"""
+        with pq.ParquetWriter(self.file_path, self.schema) as writer:
+            batches = []
+            buffered_rows = 0
+            for batch in self._read_batches(self.partial_path):
+                batches.append(batch)
+                buffered_rows += batch.num_rows
+                if buffered_rows >= Settings.PARQUET_ROW_GROUP_SIZE:
+                    writer.write_table(pa.Table.from_batches(batches, self.schema))
+                    batches = []
+                    buffered_rows = 0
+            if batches:
+                writer.write_table(pa.Table.from_batches(batches, self.schema))
+                
+    def _finish(self):
+        """途中経過ファイルをParquetに変換して削除"""
+        self._export()
+        self.partial_path.unlink()
+        
+    @staticmethod
+    def _read_batches(path):
+        """途中経過ファイルのバッチを順に返す（終端が書き込まれていないストリームも読める）"""
+        with pa.OSFile(str(path)) as source, pa.ipc.open_stream(source) as reader:
+            yield from reader
+
+
+# 出力形式→出力クラス
+OUTPUT_WRITERS = {
+    'xlsx': ExcelWriter,
+    'csv': CsvWriter,
+    'jsonl': JsonLinesWriter,
+    'parquet': ParquetWriter
+}
+
+
+def available_formats():
+    """この環境で使用できる出力形式を返す"""
+    return [output_format for output_format, writer in OUTPUT_WRITERS.items() if writer.available()]
\ No newline at end of file
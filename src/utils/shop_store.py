@@ -0,0 +1,223 @@
+"""
+店舗データベース機能
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from config import Settings
+from .date_filter import DateFilter
+
+
+# 店舗詳細ページのURLから取り出した識別情報（url: クエリやサブページを除いた正規のURL）
+ShopKey = namedtuple('ShopKey', ['shop_id', 'url', 'prefecture', 'area_code', 'small_area_code'])
+
+
+class ShopStore:
+    """SQLiteを使った店舗データベースクラス
+    
+    取得した店舗情報を店舗IDごとに1件にまとめて蓄積する（同じ店舗は後から取得した項目で更新）。
+    都道府県・エリア・ジャンル・オープン年月には索引を作成し、複数回のクロール結果を横断して検索できる。
+    """
+    
+    # 店舗詳細ページのURL（例: https://tabelog.com/tokyo/A1301/A130101/13000000/dtlmenu/）
+    SHOP_URL_PATTERN = re.compile(
+        r'^https?://tabelog\.com/([a-z]+)/(A\d{4})/(A\d{6})/(\d{7,})(?:[/?#]|$)'
+    )
+    
+    # ジャンルの区切り文字
+    GENRE_SEPARATOR = re.compile(r'\s*[、,]\s*')
+    
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str): データベースファイルのパス
+        """
+        self.path = path or f"{Settings.SHOP_STORE_NAME}.sqlite"
+        self.lock = threading.Lock()
+        
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute('PRAGMA busy_timeout=5000')
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS shops (
+                shop_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                prefecture TEXT,
+                area_code TEXT,
+                small_area_code TEXT,
+                name TEXT,
+                genre TEXT,
+                opened_date TEXT,
+                opened_year INTEGER,
+                opened_month INTEGER,
+                record TEXT NOT NULL,
+                first_seen_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        # ジャンルは複数のため店舗ごとに分けて持つ
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS shop_genres (
+                genre TEXT NOT NULL,
+                shop_id TEXT NOT NULL,
+                PRIMARY KEY (genre, shop_id)
+            ) WITHOUT ROWID
+        """)
+        self.connection.execute(
+            'CREATE INDEX IF NOT EXISTS idx_shops_prefecture_opened ON shops (prefecture, opened_year, opened_month)'
+        )
+        self.connection.execute('CREATE INDEX IF NOT EXISTS idx_shops_area ON shops (area_code, small_area_code)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS idx_shops_opened ON shops (opened_year, opened_month)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS idx_shop_genres_shop_id ON shop_genres (shop_id)')
+        self.connection.commit()
+        
+    @classmethod
+    def parse_url(cls, url):
+        """
+        店舗詳細ページのURLから店舗IDとエリアを取り出す
+        
+        Returns:
+            ShopKey: 識別情報（食べログの店舗URLでない場合はURL全体を店舗IDとして扱う）
+        """
+        match = cls.SHOP_URL_PATTERN.match(url)
+        if not match:
+            url = url.split('#')[0].split('?')[0].rstrip('/') + '/'
+            return ShopKey(url, url, None, None, None)
+        prefecture, area_code, small_area_code, shop_id = match.groups()
+        canonical_url = f"https://tabelog.com/{prefecture}/{area_code}/{small_area_code}/{shop_id}/"
+        return ShopKey(shop_id, canonical_url, prefecture, area_code, small_area_code)
+        
+    def upsert_many(self, shops):
+        """
+        店舗情報をまとめて登録・更新する（1トランザクション）
+        
+        既に登録されている店舗は、今回取得した項目で以前の店舗情報を上書きする。
+        店舗名を取得できなかった店舗情報は登録しない。
+        
+        Args:
+            shops (list): 店舗情報のリスト（'URL'を含む辞書）
+            
+        Returns:
+            int: 登録・更新した件数
+        """
+        now = time.time()
+        count = 0
+        with self.lock:
+            for shop_data in shops:
+                if not shop_data.get('URL') or shop_data.get('店舗名') == Settings.NO_DATA_VALUE:
+                    continue
+                key = self.parse_url(shop_data['URL'])
+                row = self.connection.execute(
+                    'SELECT record, first_seen_at FROM shops WHERE shop_id = ?', (key.shop_id,)
+                ).fetchone()
+                record = {**json.loads(row[0]), **shop_data} if row else dict(shop_data)
+                first_seen_at = row[1] if row else now
+                
+                genre = record.get('ジャンル')
+                opened_date = record.get('オープン日')
+                opened = DateFilter.parse_opened_date(opened_date)
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO shops '
+                    '(shop_id, url, prefecture, area_code, small_area_code, name, genre, opened_date, '
+                    'opened_year, opened_month, record, first_seen_at, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (
+                        key.shop_id, key.url, key.prefecture, key.area_code, key.small_area_code,
+                        record.get('店舗名'), genre, opened_date,
+                        opened[0] if opened else None, opened[1] if opened else None,
+                        json.dumps(record, ensure_ascii=False), first_seen_at, now
+                    )
+                )
+                self.connection.execute('DELETE FROM shop_genres WHERE shop_id = ?', (key.shop_id,))
+                self.connection.executemany(
+                    'INSERT OR IGNORE INTO shop_genres (genre, shop_id) VALUES (?, ?)',
+                    [(name, key.shop_id) for name in self._split_genres(genre)]
+                )
+                count += 1
+            self.connection.commit()
+        return count
+        
+    def get(self, url, max_age=None):
+        """
+        店舗情報を取得する
+        
+        Args:
+            url (str): 店舗詳細ページのURL
+            max_age (float): 最後に更新されてからの経過時間の上限（秒、Noneの場合は制限なし）
+            
+        Returns:
+            dict: 店舗情報（登録されていない場合・上限より古い場合はNone）
+        """
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT record, updated_at FROM shops WHERE shop_id = ?', (self.parse_url(url).shop_id,)
+            ).fetchone()
+        if row is None or (max_age is not None and time.time() - row[1] > max_age):
+            return None
+        return json.loads(row[0])
+        
+    def find(self, prefecture=None, area_code=None, genre=None, opened_year=None, opened_month=None):
+        """
+        条件に合う店舗情報を検索する（指定しない条件は絞り込まない）
+        
+        例: 2025年3月にオープンした東京都の店舗
+            store.find(prefecture='tokyo', opened_year=2025, opened_month=3)
+            
+        Args:
+            prefecture (str): 都道府県コード（URLの都道府県部分、例: 'tokyo'）
+            area_code (str): 中項目または小項目のエリアコード（例: 'A1301'、'A130101'）
+            genre (str): ジャンル（「、」で区切られた1つ分、例: 'イタリアン'）
+            opened_year (int): オープン年
+            opened_month (int): オープン月
+            
+        Returns:
+            list: 店舗情報のリスト（オープン日の新しい順）
+        """
+        conditions = []
+        values = []
+        if prefecture:
+            conditions.append('shops.prefecture = ?')
+            values.append(prefecture)
+        if area_code:
+            # 小項目のコードは先頭が中項目のコードのため、どちらも(area_code, small_area_code)の索引で絞り込める
+            conditions.append('shops.area_code = ?')
+            values.append(area_code[:5])
+            if len(area_code) > 5:
+                conditions.append('shops.small_area_code = ?')
+                values.append(area_code)
+        if genre:
+            conditions.append('shops.shop_id IN (SELECT shop_id FROM shop_genres WHERE genre = ?)')
+            values.append(genre)
+        if opened_year:
+            conditions.append('shops.opened_year = ?')
+            values.append(opened_year)
+        if opened_month:
+            conditions.append('shops.opened_month = ?')
+            values.append(opened_month)
+            
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        with self.lock:
+            rows = self.connection.execute(
+                f'SELECT record FROM shops {where} '
+                'ORDER BY shops.opened_year DESC, shops.opened_month DESC, shops.shop_id',
+                values
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+        
+    def close(self):
+        """データベースを閉じる"""
+        with self.lock:
+            self.connection.close()
+            
+    @classmethod
+    def _split_genres(cls, genre):
+        """ジャンルの文字列を1つずつに分割"""
+        if not genre or genre == Settings.NO_DATA_VALUE:
+            return []
+        return [name for name in cls.GENRE_SEPARATOR.split(genre) if name]
\ No newline at end of file